@@ -3,12 +3,17 @@ import json
 import os
 import csv
 import zipfile
-import re
-from datasets import load_dataset
+from contextlib import nullcontext
+from medu_parse import parse_medut_file
+from medu_discover import discover_papyri
+from medu_archive import open_medut_source, glyph_image_index, read_glyph_image, glyph_data_uri
+from medu_merge import gardiner_sorted
+from medu_columnar import seal_medut_columnar
 import pandas as pd
 from reportlab.lib.pagesizes import letter, landscape, portrait
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
 from PIL import Image, ImageDraw, ImageFont
 
 # === INTERACTIVE CONFIGURATION ===
@@ -31,6 +36,9 @@ grid_columns = int(input("Enter number of columns for grid layout (e.g., 4): ").
 # Acknowledgements
 ack_text = input("Enter acknowledgements (e.g., Unicode Consortium, Gardiner List, Your Name): ").strip()
 
+# Glyph images can be read straight out of an archive (e.g. Signs_Archive.zip)
+glyph_archive_path = input("Glyph image archive (.zip/.tar, blank to use glyph_images folder): ").strip()
+
 structured_signs = []
 seen_codes = set()
 
@@ -46,60 +54,37 @@ def create_placeholder_image(glyph, img_path):
     draw.text(((image_size - w) / 2, (image_size - h) / 2), glyph, fill="black", font=font)
     img.save(img_path)
 
-# === Helper: Sort by Gardiner code ===
-def gardiner_sort_key(code):
-    match = re.match(r"([A-Z]+)(\d+)?", code)
-    if match:
-        letter = match.group(1)
-        number = int(match.group(2)) if match.group(2) else 0
-        return (letter, number)
-    return (code, 0)
+# === Helper: Glyph image from archive, else from disk (placeholder if missing) ===
+def glyph_image(entry):
+    if glyph_archive is not None:
+        stream = read_glyph_image(glyph_archive, glyph_archive_index, entry["code"])
+        if stream is not None:
+            return ImageReader(stream)
+    img_path = os.path.join(image_folder, f"{entry['code']}.png")
+    if not os.path.exists(img_path):
+        create_placeholder_image(entry["glyph"], img_path)
+    return img_path
+
+# === Helper: <img> source for the HTML index (inline from the archive, else a relative path) ===
+def glyph_html_src(entry):
+    if glyph_archive is not None:
+        uri = glyph_data_uri(glyph_archive, glyph_archive_index, entry["code"])
+        if uri is not None:
+            return uri
+    img_path = os.path.join(image_folder, f"{entry['code']}.png")
+    if not os.path.exists(img_path):
+        create_placeholder_image(entry["glyph"], img_path)
+    return os.path.relpath(img_path, input_folder).replace(os.sep, "/")
 
 # === PARSE FILES ===
-for filename in os.listdir(input_folder):
-    if filename.lower().endswith(".txt"):
-        file_path = os.path.join(input_folder, filename)
-        print(f"[Debug] Processing file: {file_path}")
-
-        dataset = load_dataset('text', data_files=file_path)
-        lines = [row['text'].strip() for row in dataset['train'] if row['text'].strip()]
-
-        current_category = None
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            if "-" in line and not any(ch.isdigit() for ch in line):
-                current_category = line
-                i += 1
-                continue
-
-            if i + 1 < len(lines):
-                code = line
-                glyph_line = lines[i + 1]
-                description = ""
-                glyph_parts = glyph_line.split(maxsplit=1)
-                glyph = glyph_parts[0]
-                if len(glyph_parts) > 1:
-                    description = glyph_parts[1]
-
-                unicode_escape = glyph.encode('unicode_escape').decode('utf-8')
-                hex_points = " ".join([f"U+{ord(ch):04X}" for ch in glyph])
-
-                entry = {
-                    "category": current_category or filename.replace(".txt", ""),
-                    "code": code,
-                    "glyph": glyph,
-                    "unicode_escape": unicode_escape,
-                    "unicode_hex": hex_points,
-                    "description": description
-                }
-
-                if code not in seen_codes:
-                    structured_signs.append(entry)
-                    seen_codes.add(code)
-
-            i += 2
+for filename in discover_papyri(input_folder):
+    file_path = os.path.join(input_folder, filename)
+    print(f"[Debug] Processing file: {file_path}")
+
+    for entry in parse_medut_file(file_path):
+        if entry["code"] not in seen_codes:
+            structured_signs.append(entry)
+            seen_codes.add(entry["code"])
 
 print(f"[Debug] Parsed {len(structured_signs)} unique structured signs")
 
@@ -139,9 +124,12 @@ for cat, items in categories.items():
 excel_output = os.path.join(input_folder, "Signs_All.xlsx")
 excel_writer = pd.ExcelWriter(excel_output, engine='openpyxl')
 
-for csv_path in all_csv_paths:
-    sheet_name = os.path.splitext(os.path.basename(csv_path))[0][:31]
-    df = pd.read_csv(csv_path)
+# Sheets come straight from the parsed records; no CSV round trip.
+sheet_columns = ["Category", "Code", "Glyph", "Unicode Escape", "Unicode Hex", "Description"]
+for cat, items in categories.items():
+    sheet_name = cat.replace(" ", "_").replace("-", "_")[:31]
+    df = pd.DataFrame([[entry["category"], entry["code"], entry["glyph"], entry["unicode_escape"], entry["unicode_hex"], entry["description"]]
+                       for entry in items], columns=sheet_columns)
     df.to_excel(excel_writer, sheet_name=sheet_name, index=False)
 
 summary_data = [{"Category": cat, "Sign Count": len(items)} for cat, items in categories.items()]
@@ -152,61 +140,97 @@ summary_df.to_excel(excel_writer, sheet_name="Summary", index=False)
 excel_writer.close()
 print(f"[Debug] Excel file created: {excel_output}")
 
-# === HTML INDEX EXPORT ===
-html_output = os.path.join(input_folder, "Signs_Index.html")
-with open(html_output, 'w', encoding='utf-8') as f:
-    f.write("<!DOCTYPE html><html><head><meta charset='UTF-8'><title>Egyptian Signs Index</title>")
-    f.write("<style>body{font-family:Arial;margin:20px;}h1{color:#333;}a{display:block;margin:5px 0;text-decoration:none;color:#007BFF;}a:hover{color:#0056b3;}</style></head><body>")
-    f.write("<h1>Egyptian Hieroglyphs Index</h1><p>Click a category to view its section in the PDF:</p>")
+# === PARQUET / ARROW EXPORT ===
+parquet_output = os.path.join(input_folder, "Signs_Master.parquet")
+arrow_output = os.path.join(input_folder, "Signs_Master.arrow")
+if seal_medut_columnar(parquet_output, arrow_output, structured_signs) is not None:
+    print(f"[Debug] Parquet and Arrow files created: {parquet_output}, {arrow_output}")
+
+# Glyph images are read from the archive (when given) until both PDFs are drawn.
+with (open_medut_source(glyph_archive_path) if glyph_archive_path else nullcontext()) as glyph_archive:
+    glyph_archive_index = glyph_image_index(glyph_archive) if glyph_archive else {}
+
+    # === HTML INDEX EXPORT ===
+    html_output = os.path.join(input_folder, "Signs_Index.html")
+    with open(html_output, 'w', encoding='utf-8') as f:
+        f.write("<!DOCTYPE html><html><head><meta charset='UTF-8'><title>Egyptian Signs Index</title>")
+        f.write("<style>body{font-family:Arial;margin:20px;}h1{color:#333;}a{display:block;margin:5px 0;text-decoration:none;color:#007BFF;}a:hover{color:#0056b3;}</style></head><body>")
+        f.write("<h1>Egyptian Hieroglyphs Index</h1><p>Click a category to view its section in the PDF:</p>")
+        for cat, items in categories.items():
+            icon = f"<img src='{glyph_html_src(items[0])}' alt='{items[0]['code']}' width='24' height='24'> "
+            f.write(f"<a href='Signs_Grid_ByCategory.pdf#{cat}'>{icon}{cat}</a>")
+        f.write("<hr><h2>Downloads</h2>")
+        f.write("<a href='Signs_Grid_ByCategory.pdf'>Download Grid PDF (By Category)</a>")
+        f.write("<a href='Signs_Grid_Sorted.pdf'>Download Grid PDF (Sorted)</a>")
+        f.write("<a href='Signs_All.xlsx'>Download Excel Workbook</a>")
+        f.write("<a href='Signs_Master.json'>Download Master JSON</a>")
+        f.write("<hr><p><strong>Acknowledgements:</strong> " + ack_text + "</p>")
+        f.write("</body></html>")
+    print(f"[Debug] HTML index created: {html_output}")
+
+    # === PDF GRID WITH CLICKABLE INDEX ===
+    grid_pdf_output = os.path.join(input_folder, "Signs_Grid_ByCategory.pdf")
+    c = canvas.Canvas(grid_pdf_output, pagesize=pdf_orientation)
+    width, height = pdf_orientation
+    x_positions = [inch + i * (width - 2 * inch) / grid_columns for i in range(grid_columns)]
+    y = height - inch
+
+    # Create clickable index page
+    c.setFont("Helvetica-Bold", pdf_font_size + 4)
+    c.drawString(inch, y, "Egyptian Signs Index")
+    y -= 40
+    c.setFont("Helvetica", pdf_font_size + 2)
     for cat in categories.keys():
-        f.write(f"<a href='Signs_Grid_ByCategory.pdf#{cat}'>{cat}</a>")
-    f.write("<hr><h2>Downloads</h2>")
-    f.write("<a href='Signs_Grid_ByCategory.pdf'>Download Grid PDF (By Category)</a>")
-    f.write("<a href='Signs_Grid_Sorted.pdf'>Download Grid PDF (Sorted)</a>")
-    f.write("<a href='Signs_All.xlsx'>Download Excel Workbook</a>")
-    f.write("<a href='Signs_Master.json'>Download Master JSON</a>")
-    f.write("<hr><p><strong>Acknowledgements:</strong> " + ack_text + "</p>")
-    f.write("</body></html>")
-print(f"[Debug] HTML index created: {html_output}")
-
-# === PDF GRID WITH CLICKABLE INDEX ===
-grid_pdf_output = os.path.join(input_folder, "Signs_Grid_ByCategory.pdf")
-c = canvas.Canvas(grid_pdf_output, pagesize=pdf_orientation)
-width, height = pdf_orientation
-x_positions = [inch + i * (width - 2 * inch) / grid_columns for i in range(grid_columns)]
-y = height - inch
-
-# Create clickable index page
-c.setFont("Helvetica-Bold", pdf_font_size + 4)
-c.drawString(inch, y, "Egyptian Signs Index")
-y -= 40
-c.setFont("Helvetica", pdf_font_size + 2)
-for cat in categories.keys():
-    c.bookmarkPage(cat)
-    c.addOutlineEntry(cat, cat, level=0)
-    c.drawString(inch, y, f"{cat}")
-    c.linkRect("", cat, (inch, y - 5, inch + 200, y + 10))
-    y -= 20
-y -= 40
-c.setFont("Helvetica-Oblique", pdf_font_size)
-c.drawString(inch, y, f"Acknowledgements: {ack_text}")
-c.showPage()
-
-# Draw categories with bookmarks
-for cat, items in categories.items():
-    c.bookmarkPage(cat)
-    c.setFont("Helvetica-Bold", pdf_font_size + 2)
-    c.drawString(inch, height - inch, f"Category: {cat}")
-    y = height - inch - 40
-    col_index = 0
+        c.bookmarkPage(cat)
+        c.addOutlineEntry(cat, cat, level=0)
+        c.drawString(inch, y, f"{cat}")
+        c.linkRect("", cat, (inch, y - 5, inch + 200, y + 10))
+        y -= 20
+    y -= 40
+    c.setFont("Helvetica-Oblique", pdf_font_size)
+    c.drawString(inch, y, f"Acknowledgements: {ack_text}")
+    c.showPage()
+
+    # Draw categories with bookmarks
+    for cat, items in categories.items():
+        c.bookmarkPage(cat)
+        c.setFont("Helvetica-Bold", pdf_font_size + 2)
+        c.drawString(inch, height - inch, f"Category: {cat}")
+        y = height - inch - 40
+        col_index = 0
 
-    for entry in items:
-        img_path = os.path.join(image_folder, f"{entry['code']}.png")
-        if not os.path.exists(img_path):
-            create_placeholder_image(entry["glyph"], img_path)
+        for entry in items:
+            x = x_positions[col_index]
+            c.drawImage(glyph_image(entry), x, y - image_size, width=image_size, height=image_size)
+            c.drawString(x, y - image_size - 15, f"{entry['code']} ({entry['description']})")
+            col_index += 1
+
+            if col_index >= grid_columns:
+                col_index = 0
+                y -= 80
+                if y < inch + 80:
+                    c.showPage()
+                    y = height - inch
+
+    c.save()
+    print(f"[Debug] Grid PDF with clickable index created: {grid_pdf_output}")
+
+    # === PDF GRID SORTED BY GARDINER CODE ===
+    sorted_signs = gardiner_sorted(structured_signs)  # external sort: bounded memory, consumed lazily by the loop below
+    sorted_pdf_output = os.path.join(input_folder, "Signs_Grid_Sorted.pdf")
+    c = canvas.Canvas(sorted_pdf_output, pagesize=pdf_orientation)
+    width, height = pdf_orientation
+    x_positions = [inch + i * (width - 2 * inch) / grid_columns for i in range(grid_columns)]
+    y = height - inch
 
+    c.setFont("Helvetica-Bold", pdf_font_size + 2)
+    c.drawString(inch, y, "Egyptian Signs Grid (Sorted by Gardiner Code)")
+    y -= 80
+
+    col_index = 0
+    for entry in sorted_signs:
         x = x_positions[col_index]
-        c.drawImage(img_path, x, y - image_size, width=image_size, height=image_size)
+        c.drawImage(glyph_image(entry), x, y - image_size, width=image_size, height=image_size)
         c.drawString(x, y - image_size - 15, f"{entry['code']} ({entry['description']})")
         col_index += 1
 
@@ -217,41 +241,8 @@ for cat, items in categories.items():
                 c.showPage()
                 y = height - inch
 
-c.save()
-print(f"[Debug] Grid PDF with clickable index created: {grid_pdf_output}")
-
-# === PDF GRID SORTED BY GARDINER CODE ===
-sorted_signs = sorted(structured_signs, key=lambda e: gardiner_sort_key(e["code"]))
-sorted_pdf_output = os.path.join(input_folder, "Signs_Grid_Sorted.pdf")
-c = canvas.Canvas(sorted_pdf_output, pagesize=pdf_orientation)
-width, height = pdf_orientation
-x_positions = [inch + i * (width - 2 * inch) / grid_columns for i in range(grid_columns)]
-y = height - inch
-
-c.setFont("Helvetica-Bold", pdf_font_size + 2)
-c.drawString(inch, y, "Egyptian Signs Grid (Sorted by Gardiner Code)")
-y -= 80
-
-col_index = 0
-for entry in sorted_signs:
-    img_path = os.path.join(image_folder, f"{entry['code']}.png")
-    if not os.path.exists(img_path):
-        create_placeholder_image(entry["glyph"], img_path)
-
-    x = x_positions[col_index]
-    c.drawImage(img_path, x, y - image_size, width=image_size, height=image_size)
-    c.drawString(x, y - image_size - 15, f"{entry['code']} ({entry['description']})")
-    col_index += 1
-
-    if col_index >= grid_columns:
-        col_index = 0
-        y -= 80
-        if y < inch + 80:
-            c.showPage()
-            y = height - inch
-
-c.save()
-print(f"[Debug] Grid PDF sorted by Gardiner code created: {sorted_pdf_output}")
+    c.save()
+    print(f"[Debug] Grid PDF sorted by Gardiner code created: {sorted_pdf_output}")
 
 # === README ===
 readme_path = os.path.join(input_folder, "README.txt")
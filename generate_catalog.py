@@ -1,27 +1,51 @@
-
-import json
+import os
+from itertools import chain
+from medu_catalog import load_catalog
+from medu_ndjson import NdjsonMaster, ndjson_master_path, ndjson_master_fresh
+from medu_lazy import LazyCatalog, category_index_fresh
+from medu_export import seal_medut_catalog_stream
+from medu_merge import gardiner_sorted
 
 # Path to your master sign file
 json_path = r"C:\learnpython\medu_neTcher\Signs_Master.json"
 output_path = r"C:\learnpython\medu_neTcher\complete_catalog.txt"
+sorted_output_path = r"C:\learnpython\medu_neTcher\complete_catalog_gardiner.txt"
+ndjson_path = ndjson_master_path(json_path)
+category_dir = os.path.join(os.path.dirname(json_path), "signs_by_category_json")
+
+
+def catalog_sections():
+    """(category, entries) in first-seen order."""
+    if ndjson_master_fresh(ndjson_path, json_path):
+        # Stream each category straight from its byte ranges; nothing is held in memory.
+        with NdjsonMaster(ndjson_path) as master:
+            for cat in master.categories():
+                yield cat, master.category(cat)
+        return
+
+    if category_index_fresh(category_dir, json_path):
+        # One category file at a time; the LRU holds a single partition.
+        catalog = LazyCatalog(category_dir, max_partitions=1)
+        for cat in catalog.categories():
+            yield cat, catalog.category(cat)
+        return
+
+    # Load all signs (binary catalog when fresh, JSON otherwise) and group them by category
+    categories = {}
+    for entry in load_catalog(json_path):
+        cat = entry.get("category", "Uncategorized")
+        categories.setdefault(cat, []).append(entry)
+    yield from categories.items()
+
+
+def catalog_records():
+    return chain.from_iterable(entries for cat, entries in catalog_sections())
+
+
+# Write catalog to file, one sign at a time
+count = seal_medut_catalog_stream(output_path, catalog_records())
+print(f"Complete catalog written to {output_path} ({count} signs)")
 
-# Load all signs
-with open(json_path, "r", encoding="utf-8") as f:
-    signs = json.load(f)
-
-# Group signs by category
-categories = {}
-for entry in signs:
-    cat = entry.get("category", "Uncategorized")
-    categories.setdefault(cat, []).append(entry)
-
-# Write catalog to file
-with open(output_path, "w", encoding="utf-8") as out:
-    for cat, entries in categories.items():
-        out.write(f"=== {cat} ===\n")
-        for entry in entries:
-            # Each line: code, glyph, description
-            out.write(f"{entry['code']}\t{entry['glyph']}\t{entry.get('description','')}\n")
-        out.write("\n")
-
-print(f"Complete catalog written to {output_path}")
+# Same catalog in Gardiner order; the external sort keeps memory bounded for huge catalogs
+count = seal_medut_catalog_stream(sorted_output_path, gardiner_sorted(catalog_records()))
+print(f"Gardiner-ordered catalog written to {sorted_output_path} ({count} signs)")
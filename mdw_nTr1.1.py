@@ -2,7 +2,7 @@ import json
 import os
 import csv
 import zipfile
-import re
+from medu_merge import gardiner_sorted
 from datasets import load_dataset
 import pandas as pd
 from reportlab.lib.pagesizes import letter, landscape, portrait
@@ -134,14 +134,6 @@ def create_placeholder_image(glyph, img_path):
     draw.text(((image_size - w) / 2, (image_size - h) / 2), glyph, fill="black", font=font)
     img.save(img_path)
 
-def gardiner_sort_key(code):
-    match = re.match(r"([A-Z]+)(\d+)?", code)
-    if match:
-        letter = match.group(1)
-        number = int(match.group(2)) if match.group(2) else 0
-        return (letter, number)
-    return (code, 0)
-
 # -------------------------------
 # Parse .txt files into structured signs
 # -------------------------------
@@ -295,7 +287,7 @@ c.save()
 # -------------------------------
 # Sorted PDF
 # -------------------------------
-sorted_signs = sorted(structured_signs, key=lambda e: gardiner_sort_key(e["code"]))
+sorted_signs = gardiner_sorted(structured_signs)  # external sort: bounded memory, consumed lazily by the loop below
 sorted_pdf_output = os.path.join(input_folder, "Signs_Grid_Sorted.pdf")
 c = canvas.Canvas(sorted_pdf_output, pagesize=pdf_orientation)
 width, height = pdf_orientation
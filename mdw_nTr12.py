@@ -9,7 +9,8 @@ import logging
 import time
 from datetime import datetime
 from tqdm import tqdm
-from datasets import load_dataset
+from medu_parse import parse_medut_file
+from medu_discover import discover_papyri
 from PIL import Image, ImageDraw, ImageFont
 
 # --- Configuration ---
@@ -68,7 +69,7 @@ log_progress(f"Output folder: {OUTPUT_FOLDER}")
 
 # --- Discover TXT Files ---
 log_idle_time("Discover TXT Files")
-txt_files = [f for f in os.listdir(INPUT_FOLDER) if f.lower().endswith(".txt")]
+txt_files = discover_papyri(INPUT_FOLDER)
 log_progress(f"Found {len(txt_files)} .txt files in input folder.")
 
 # --- Parse TXT Files into Structured Signs ---
@@ -78,43 +79,14 @@ seen_codes = set()
 for idx, filename in enumerate(txt_files, start=1):
     file_path = os.path.join(INPUT_FOLDER, filename)
     try:
-        dataset = load_dataset('text', data_files=file_path)
-        lines = [row['text'].strip() for row in dataset['train'] if row['text'].strip()]
+        for entry in parse_medut_file(file_path):
+            if entry["code"] not in seen_codes:
+                structured_signs.append(entry)
+                seen_codes.add(entry["code"])
     except Exception as e:
         log_progress(f"Error reading {file_path}: {e}")
         continue
 
-    current_category = None
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if "-" in line and not any(ch.isdigit() for ch in line):
-            current_category = line
-            i += 1
-            continue
-        if i + 1 < len(lines):
-            code = line
-            glyph_line = lines[i + 1]
-            description = ""
-            glyph_parts = glyph_line.split(maxsplit=1)
-            glyph = glyph_parts[0]
-            if len(glyph_parts) > 1:
-                description = glyph_parts[1]
-            unicode_escape = glyph.encode('unicode_escape').decode('utf-8')
-            hex_points = " ".join([f"U+{ord(ch):04X}" for ch in glyph])
-            entry = {
-                "category": current_category or filename.replace(".txt", ""),
-                "code": code,
-                "glyph": glyph,
-                "unicode_escape": unicode_escape,
-                "unicode_hex": hex_points,
-                "description": description
-            }
-            if code not in seen_codes:
-                structured_signs.append(entry)
-                seen_codes.add(code)
-            i += 2
-
 log_progress("Parsing complete.")
 
 # --- Generate Glyph Images ---
@@ -2,11 +2,28 @@
 import os
 from tqdm import tqdm
 import json
-import csv
 import zipfile
-import re
 import logging
-from datasets import load_dataset
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from medu_parse import parse_medut_file, seal_medut_diagnostics
+from medu_discover import discover_papyri, discover_source_papyri
+from medu_archive import open_medut_source, parse_source_papyrus
+from medu_watch import watch_papyri, refresh_kheper_archive
+from medu_diff import diff_catalogs, affected_outputs, affected_exports, summarize_change_set, is_empty_change_set
+from medu_table import SignTable
+from medu_stamp import source_stat
+from medu_export import seal_medut_json_stream, seal_medut_csv_stream
+from medu_catalog import seal_medut_binary, binary_catalog_path
+from medu_ndjson import seal_medut_ndjson, ndjson_master_path, load_ndjson_index
+from medu_mph import seal_medut_mph, mph_path
+from medu_sqlite import seal_medut_sqlite
+from medu_columnar import seal_medut_columnar
+from medu_lazy import seal_category_index, category_index_path
+from medu_prefix import seal_prefix_index, restamp_prefix_index, prefix_index_path
+from medu_search import seal_description_index, restamp_description_index, description_index_path
+from medu_ingest import new_ingest_manifest, load_ingest_manifest, save_ingest_manifest, ingest_papyri, prune_ingest_manifest, manifest_diagnostics
 import pandas as pd
 from reportlab.lib.pagesizes import letter, landscape, portrait
 from reportlab.pdfgen import canvas
@@ -87,34 +104,6 @@ def setup_logging(log_path):
         datefmt="%Y-%m-%d %H:%M:%S"
     )
 
-# --------------------------
-# Command-line arguments
-# --------------------------
-parser = argparse.ArgumentParser(description="Per medut kheper: Generate glyph images and scrolls")
-parser.add_argument("--input_folder", type=str, default="C:\\learnpython\\input", help="Per medut in (input folder)")
-parser.add_argument("--output_folder", type=str, default="C:\\learnpython\\output", help="Per medut out (output folder)")
-parser.add_argument("--overwrite", action="store_true", help="Overwrite existing scrolls if they exist")
-parser.add_argument("--orientation", type=str, choices=["portrait", "landscape"], default="portrait", help="Scroll orientation")
-args = parser.parse_args()
-per_medut_in = args.input_folder
-per_medut_out = args.output_folder
-overwrite = args.overwrite
-orientation_choice = args.orientation
-
-os.makedirs(per_medut_in, exist_ok=True)
-os.makedirs(per_medut_out, exist_ok=True)
-
-# Setup logging
-log_path = os.path.join(per_medut_out, "process_log.txt")
-setup_logging(log_path)
-
-pdf_orientation = landscape(letter) if orientation_choice == "landscape" else portrait(letter)
-print(f"Per medut in: {per_medut_in}")
-print(f"Per medut out: {per_medut_out}")
-print(f"Scroll orientation: {orientation_choice}")
-print(f"Overwrite enabled: {overwrite}")
-logging.info("Opening the Scroll: Initial configuration complete.")
-
 # --------------------------
 # Validation Helpers
 # --------------------------
@@ -194,31 +183,6 @@ def show_progress_sesh(current, total, task_name):
         print(" ✅")
         logging.info(f"Ma’at Kheper: {task_name} completed.")
 
-# --------------------------
-# User Input with Validation
-# --------------------------
-log_idle_time("User Input Validation")
-DEFAULT_FOLDER = r"C:\Users\calmc\OneDrive\medu_neTcher"
-folder_path = get_valid_directory(f"Enter papyri path [default: {DEFAULT_FOLDER}]: ", default=DEFAULT_FOLDER)
-orientation = input(f"Choose scroll orientation (portrait/landscape) [default: {orientation_choice}]: ").strip() or orientation_choice
-maat_font_size = get_int_input("Enter font size for scroll (e.g., 10): ", default=10)
-image_size = get_int_input("Enter glyph image size in pixels (e.g., 50): ", default=50)
-sesh_columns = get_int_input("Enter number of columns for scroll layout (e.g., 4): ", default=4)
-djed_medut_ack = input("Enter acknowledgements (e.g., Unicode Consortium, Gardiner List): ").strip() or "Unicode Consortium, Gardiner List"
-pdf_path = get_valid_filename("C:\\learnpython\\output (e.g., glyph_output.pdf): ", per_medut_out, default="glyph_output.pdf", overwrite=overwrite)
-
-# --------------------------
-# Prepare folders
-# --------------------------
-log_idle_time("Prepare Folders")
-per_sesh_seshu = os.path.join(per_medut_in, "glyph_images")
-os.makedirs(per_sesh_seshu, exist_ok=True)
-output_folder_json = os.path.join(per_medut_in, "signs_by_category_json")
-output_folder_csv = os.path.join(per_medut_in, "signs_by_category_csv")
-os.makedirs(output_folder_json, exist_ok=True)
-os.makedirs(output_folder_csv, exist_ok=True)
-logging.info("Opening the Scroll: Houses prepared for medut.")
-
 # --------------------------
 # Helper Functions with Kemety Names
 # --------------------------
@@ -250,16 +214,6 @@ def seal_medut_json(path, data):
     except Exception as e:
         logging.error(f"Isfet Kheper: Failed to seal JSON papyrus ({path}) - {e}")
 
-def seal_medut_csv(path, rows):
-    try:
-        with open(path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            for row in rows:
-                writer.writerow(row)
-        logging.info(f"Sesh medu: Papyrus sealed in CSV ({path})")
-    except Exception as e:
-        logging.error(f"Isfet Kheper: Failed to seal CSV papyrus ({path}) - {e}")
-
 def seal_kheper_archive(zip_path, files):
     try:
         for idx, path in enumerate(files, start=1):
@@ -274,126 +228,369 @@ def seal_kheper_archive(zip_path, files):
     except Exception as e:
         logging.error(f"Isfet Kheper: Failed to seal archive ({zip_path}) - {e}")
 
-def gardiner_sort_key(code):
-    match = re.match(r"([A-Z]+)(\d+)?", code)
-    if match:
-        letter = match.group(1)
-        number = int(match.group(2)) if match.group(2) else 0
-        return (letter, number)
-    return (code, 0)
+def category_papyrus_paths(cat):
+    safe_cat = cat.replace(" ", "_").replace("-", "_")
+    return os.path.join(output_folder_json, f"{safe_cat}.json"), os.path.join(output_folder_csv, f"{safe_cat}.csv")
 
-# --------------------------
-# Parse .txt files into structured signs
-# --------------------------
-log_idle_time("Parsing glyph papyri")
-structured_signs_medut = []
-seen_codes = set()
-txt_files = [f for f in os.listdir(per_medut_in) if f.lower().endswith(".txt")]
-total_files = len(txt_files)
-print(f"Opening the Scroll: Parsing {total_files} papyri...")
-logging.info(f"Opening the Scroll: Parsing {total_files} text files.")
-for idx, filename in enumerate(txt_files, start=1):
-    show_progress_sesh(idx, total_files, "Parsing glyph papyri")
-    file_path = os.path.join(per_medut_in, filename)
+def seal_category_papyri(cat, rows):
+    # Both papyri stream their records straight from the sign table; no per-category list is built.
+    cat_json_file, cat_csv_file = category_papyrus_paths(cat)
+    try:
+        seal_medut_json_stream(cat_json_file, structured_signs_medut.records(rows))
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal JSON papyrus ({cat_json_file}) - {e}")
     try:
-        dataset = load_dataset('text', data_files=file_path)
-        lines = [row['text'].strip() for row in dataset['train'] if row['text'].strip()]
+        seal_medut_csv_stream(cat_csv_file, structured_signs_medut.records(rows))
     except Exception as e:
-        logging.error(f"Isfet Kheper: Failed to read papyrus '{file_path}' - {e}")
-        continue
-    current_category = None
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if "-" in line and not any(ch.isdigit() for ch in line):
-            current_category = line
-            i += 1
-            continue
-        if i + 1 < len(lines):
-            code = line
-            glyph_line = lines[i + 1]
-            description = ""
-            glyph_parts = glyph_line.split(maxsplit=1)
-            glyph = glyph_parts[0]
-            if len(glyph_parts) > 1:
-                description = glyph_parts[1]
-            unicode_escape = glyph.encode('unicode_escape').decode('utf-8')
-            hex_points = " ".join([f"U+{ord(ch):04X}" for ch in glyph])
-            entry = {
-                "category": current_category or filename.replace(".txt", ""),
-                "code": code,
-                "glyph": glyph,
-                "unicode_escape": unicode_escape,
-                "unicode_hex": hex_points,
-                "description": description
-            }
-            if code not in seen_codes:
-                structured_signs_medut.append(entry)
-                seen_codes.add(code)
-            i += 2
-print("\nThe Papyrus is Sealed: Parsing complete.")
-logging.info("Ma’at Kheper: Parsing completed successfully.")
+        logging.error(f"Isfet Kheper: Failed to seal CSV papyrus ({cat_csv_file}) - {e}")
+    return cat_json_file, cat_csv_file
 
-# --------------------------
-# Generate placeholder images with progress
-# --------------------------
-log_idle_time("Inscribing glyph images")
-print(f"Inscribing glyph images for {len(structured_signs_medut)} signs...")
-logging.info(f"Opening the Scroll: Generating {len(structured_signs_medut)} glyph images.")
-for entry in tqdm(structured_signs_medut, desc="Inscribing glyph images"):
-    img_path = os.path.join(per_sesh_seshu, f"{entry['code']}.png")
-    if not os.path.exists(img_path):
-        per_sesh_medut(entry["glyph"], img_path)
+def seal_gardiner_csv(path):
+    # Rows stream in the sign table's cached Gardiner order; no sorted copy of the catalog is built.
+    try:
+        seal_medut_csv_stream(path, structured_signs_medut.records(structured_signs_medut.gardiner_order()))
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal Gardiner-ordered CSV ({path}) - {e}")
+    return path
 
 # --------------------------
-# Export JSON and CSV
+# Watch mode: keep the scroll open and rebuild only what a save touches
 # --------------------------
-log_idle_time("Export JSON and CSV")
-master_output = os.path.join(per_medut_in, "Signs_Master.json")
-seal_medut_json(master_output, structured_signs_medut)
-categories = {}
-for entry in structured_signs_medut:
-    categories.setdefault(entry["category"], []).append(entry)
-all_json_paths = [master_output]
-all_csv_paths = []
-for cat, items in categories.items():
-    safe_cat = cat.replace(" ", "_").replace("-", "_")
-    cat_json_file = os.path.join(output_folder_json, f"{safe_cat}.json")
-    seal_medut_json(cat_json_file, items)
-    all_json_paths.append(cat_json_file)
-    cat_csv_file = os.path.join(output_folder_csv, f"{safe_cat}.csv")
-    rows = [["Category", "Code", "Glyph", "Unicode Escape", "Unicode Hex", "Description"]]
-    for entry in items:
-        rows.append([entry["category"], entry["code"], entry["glyph"], entry["unicode_escape"], entry["unicode_hex"], entry["description"]])
-    seal_medut_csv(cat_csv_file, rows)
-    all_csv_paths.append(cat_csv_file)
+def rebuild_changed_papyri(changed, args, ingest_manifest, manifest_path, sniff_cache, executor,
+                           zip_output, sqlite_output, parquet_output, arrow_output, gardiner_csv_output):
+    global structured_signs_medut, txt_files
+    start = time.perf_counter()
+    txt_files = discover_papyri(per_medut_in, include=args.include, exclude=args.exclude, recursive=not args.no_recurse, sniff_cache=sniff_cache)
+    results = ingest_papyri(
+        ingest_manifest, per_medut_in, txt_files,
+        parse=partial(parse_medut_file, mode=parse_mode), executor=executor
+    )
+    for filename, records, reparsed, seconds, error in results:
+        if error is not None:
+            logging.error(f"Isfet Kheper: Failed to read papyrus '{filename}' - {error}")
+    prune_ingest_manifest(ingest_manifest, txt_files)
+    save_ingest_manifest(manifest_path, ingest_manifest)
+    seal_medut_diagnostics(diagnostics_path, manifest_diagnostics(ingest_manifest, txt_files))
+    new_signs = SignTable.from_records(chain.from_iterable(records for filename, records, reparsed, seconds, error in results if error is None))
+    new_signs.derive_unicode()
+    change_set = diff_catalogs(structured_signs_medut, new_signs)
+    structured_signs_medut = new_signs
+    if is_empty_change_set(change_set):
+        print(f"Papyri saved ({', '.join(sorted(changed))}); no signs changed.")
+        return
+    seal_medut_json(changes_path, change_set)
+    glyph_codes, touched_categories, removed_codes = affected_outputs(change_set)
+    exports = affected_exports(change_set)
 
-# --------------------------
-# ZIP Archive
-# --------------------------
-log_idle_time("ZIP Archive")
-zip_output = os.path.join(per_medut_in, "Signs_Archive.zip")
-files_to_zip = [master_output] + all_json_paths + all_csv_paths
-seal_kheper_archive(zip_output, files_to_zip)
+    for entry in structured_signs_medut:
+        if entry["code"] in glyph_codes:
+            per_sesh_medut(entry["glyph"], os.path.join(per_sesh_seshu, f"{entry['code']}.png"))
+    removed = []
+    for code in removed_codes:
+        img_path = os.path.join(per_sesh_seshu, f"{code}.png")
+        if os.path.exists(img_path):
+            os.remove(img_path)
+        removed.append(img_path)
 
-# --------------------------
-# Summary Report
-# --------------------------
-log_idle_time("Summary Report")
-archive_size = os.path.getsize(zip_output) / (1024 * 1024) if os.path.exists(zip_output) else 0
-rekh_summary_medut = (
-    "\n=== Medu neTcher Rekh ===\n"
-    f"Papyri sesh: {total_files}\n"
-    f"Medu neTcher inscribed: {len(structured_signs_medut)}\n"
-    f"Seshu kheper: {len(structured_signs_medut)}\n"
-    f"Per medu scrolls: 1\n"
-    f"Kheper archive: {archive_size:.2f} MB\n"
-    "========================\n"
-)
-print(rekh_summary_medut)
-logging.info(rekh_summary_medut)
-summary_path = os.path.join(per_medut_in, "Summary_Report.txt")
-with open(summary_path, 'w', encoding='utf-8') as f:
-    f.write(rekh_summary_medut)
-logging.info(f"Sesh medu: Summary sealed at {summary_path}")
-........................................................................................................................................
\ No newline at end of file
+    # The catalog exports hold every field, so any change rewrites them. The
+    # prefix and description indexes are only rebuilt when their own inputs
+    # changed; otherwise they are re-stamped for the rewritten master.
+    previous_stat = source_stat(master_output)
+    seal_medut_json_stream(master_output, structured_signs_medut.records())
+    seal_medut_binary(binary_catalog_path(master_output), structured_signs_medut, master_output)
+    seal_medut_ndjson(ndjson_master_path(master_output), structured_signs_medut.records(), master_output)
+    seal_medut_mph(mph_path(master_output), structured_signs_medut, load_ndjson_index(ndjson_master_path(master_output))["codes"], master_output)
+    if "prefix" in exports or not restamp_prefix_index(prefix_index_path(master_output), previous_stat, master_output):
+        seal_prefix_index(prefix_index_path(master_output), structured_signs_medut, master_output)
+    if "search" in exports or not restamp_description_index(description_index_path(master_output), previous_stat, master_output):
+        seal_description_index(description_index_path(master_output), structured_signs_medut, master_output)
+    try:
+        seal_medut_sqlite(sqlite_output, structured_signs_medut)
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal SQLite catalog ({sqlite_output}) - {e}")
+    try:
+        seal_medut_columnar(parquet_output, arrow_output, structured_signs_medut)
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal Parquet/Arrow catalog - {e}")
+    new_categories = structured_signs_medut.category_rows()
+    written = [master_output, seal_gardiner_csv(gardiner_csv_output)]
+    for cat in touched_categories:
+        if cat in new_categories:
+            written.extend(seal_category_papyri(cat, new_categories[cat]))
+        else:
+            for path in category_papyrus_paths(cat):
+                if os.path.exists(path):
+                    os.remove(path)
+                removed.append(path)
+    seal_category_index(output_folder_json, [
+        (cat, os.path.basename(category_papyrus_paths(cat)[0]), [structured_signs_medut.codes[i] for i in rows])
+        for cat, rows in new_categories.items()
+    ], master_output)
+    written.append(category_index_path(output_folder_json))
+    refresh_kheper_archive(zip_output, written, per_medut_in, removed)
+
+    elapsed = time.perf_counter() - start
+    summary = (f"Rebuilt in {elapsed * 1000:.0f} ms: {len(glyph_codes)} glyph images, "
+               f"{len(touched_categories)} categories, {len(removed_codes)} signs removed, "
+               f"indexes rebuilt: {', '.join(sorted(exports - {'catalog'})) or 'none'} "
+               f"({', '.join(sorted(changed))})")
+    print(summary)
+    logging.info(f"Ma’at Kheper: {summary}")
+
+
+if __name__ == "__main__":
+    # Guarded so --jobs can parse in worker processes: spawned workers import
+    # this script and must not re-run the prompts and the pipeline.
+    # --------------------------
+    # Command-line arguments
+    # --------------------------
+    parser = argparse.ArgumentParser(description="Per medut kheper: Generate glyph images and scrolls")
+    parser.add_argument("--input_folder", type=str, default="C:\\learnpython\\input", help="Per medut in (input folder)")
+    parser.add_argument("--output_folder", type=str, default="C:\\learnpython\\output", help="Per medut out (output folder)")
+    parser.add_argument("--overwrite", action="store_true", help="Overwrite existing scrolls if they exist")
+    parser.add_argument("--orientation", type=str, choices=["portrait", "landscape"], default="portrait", help="Scroll orientation")
+    parser.add_argument("--reparse_all", action="store_true", help="Ignore the ingest manifest and reparse every papyrus")
+    parser.add_argument("--parse_mode", type=str, choices=["grammar", "stream", "mmap"], default="stream", help="Papyrus reader: 'grammar' classifies lines and reports broken pairs, 'stream' pairs code and glyph lines and skips (and reports) a broken pair, 'mmap' does the same at the byte level for very large sign lists")
+    parser.add_argument("--include", action="append", help="Glob of papyri to parse (repeatable, default: *.txt)")
+    parser.add_argument("--exclude", action="append", help="Glob of files to skip (repeatable, default: the pipeline's own outputs)")
+    parser.add_argument("--input_archive", type=str, help="Read the papyri straight out of this .zip/.tar instead of the input folder")
+    parser.add_argument("--no_recurse", action="store_true", help="Only look for papyri directly inside the input folder")
+    parser.add_argument("--watch", action="store_true", help="Stay running and rebuild affected outputs whenever a papyrus changes")
+    parser.add_argument("--watch_interval", type=float, default=0.25, help="Seconds between polls in watch mode")
+    parser.add_argument("--watch_debounce", type=float, default=0.4, help="Quiet seconds after the last save before rebuilding")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of papyri parsed concurrently")
+    args = parser.parse_args()
+    per_medut_in = args.input_folder
+    per_medut_out = args.output_folder
+    overwrite = args.overwrite
+    orientation_choice = args.orientation
+    reparse_all = args.reparse_all
+    parse_jobs = max(1, args.jobs)
+    parse_mode = args.parse_mode
+
+    os.makedirs(per_medut_in, exist_ok=True)
+    os.makedirs(per_medut_out, exist_ok=True)
+
+    # Setup logging
+    log_path = os.path.join(per_medut_out, "process_log.txt")
+    setup_logging(log_path)
+
+    pdf_orientation = landscape(letter) if orientation_choice == "landscape" else portrait(letter)
+    print(f"Per medut in: {per_medut_in}")
+    print(f"Per medut out: {per_medut_out}")
+    print(f"Scroll orientation: {orientation_choice}")
+    print(f"Overwrite enabled: {overwrite}")
+    logging.info("Opening the Scroll: Initial configuration complete.")
+
+    # --------------------------
+    # User Input with Validation
+    # --------------------------
+    log_idle_time("User Input Validation")
+    DEFAULT_FOLDER = r"C:\Users\calmc\OneDrive\medu_neTcher"
+    folder_path = get_valid_directory(f"Enter papyri path [default: {DEFAULT_FOLDER}]: ", default=DEFAULT_FOLDER)
+    orientation = input(f"Choose scroll orientation (portrait/landscape) [default: {orientation_choice}]: ").strip() or orientation_choice
+    maat_font_size = get_int_input("Enter font size for scroll (e.g., 10): ", default=10)
+    image_size = get_int_input("Enter glyph image size in pixels (e.g., 50): ", default=50)
+    sesh_columns = get_int_input("Enter number of columns for scroll layout (e.g., 4): ", default=4)
+    djed_medut_ack = input("Enter acknowledgements (e.g., Unicode Consortium, Gardiner List): ").strip() or "Unicode Consortium, Gardiner List"
+    pdf_path = get_valid_filename("C:\\learnpython\\output (e.g., glyph_output.pdf): ", per_medut_out, default="glyph_output.pdf", overwrite=overwrite)
+
+    # --------------------------
+    # Prepare folders
+    # --------------------------
+    log_idle_time("Prepare Folders")
+    per_sesh_seshu = os.path.join(per_medut_in, "glyph_images")
+    os.makedirs(per_sesh_seshu, exist_ok=True)
+    output_folder_json = os.path.join(per_medut_in, "signs_by_category_json")
+    output_folder_csv = os.path.join(per_medut_in, "signs_by_category_csv")
+    os.makedirs(output_folder_json, exist_ok=True)
+    os.makedirs(output_folder_csv, exist_ok=True)
+    logging.info("Opening the Scroll: Houses prepared for medut.")
+
+    # --------------------------
+    # Parse .txt files into structured signs
+    # --------------------------
+    log_idle_time("Parsing glyph papyri")
+    if args.input_archive:
+        # Archived papyri are read in place; the manifest only tracks loose files.
+        with open_medut_source(args.input_archive) as medut_source:
+            txt_files = discover_source_papyri(medut_source, include=args.include, exclude=args.exclude)
+            total_files = len(txt_files)
+            papyri_records = []
+            parse_diagnostics = []
+            archive_mode = "grammar" if parse_mode == "grammar" else "stream"
+            print(f"Opening the Scroll: Parsing {total_files} papyri from {args.input_archive}...")
+            logging.info(f"Opening the Scroll: Parsing {total_files} archived papyri from {args.input_archive}.")
+            for idx, filename in enumerate(txt_files, start=1):
+                show_progress_sesh(idx, total_files, "Parsing glyph papyri")
+                try:
+                    papyri_records.append(list(parse_source_papyrus(medut_source, filename, archive_mode, parse_diagnostics)))
+                except Exception as e:
+                    logging.error(f"Isfet Kheper: Failed to read papyrus '{filename}' from {args.input_archive} - {e}")
+        structured_signs_medut = SignTable.from_records(chain.from_iterable(papyri_records))
+    else:
+        txt_files = discover_papyri(per_medut_in, include=args.include, exclude=args.exclude, recursive=not args.no_recurse)
+        total_files = len(txt_files)
+        manifest_path = os.path.join(per_medut_in, "Ingest_Manifest.json")
+        ingest_manifest = new_ingest_manifest(parse_mode) if reparse_all else load_ingest_manifest(manifest_path, parse_mode)
+        papyri_records = []
+        dirty_papyri = []
+        print(f"Opening the Scroll: Parsing {total_files} papyri with {parse_jobs} jobs...")
+        logging.info(f"Opening the Scroll: Parsing {total_files} text files with {parse_jobs} jobs.")
+        # Parsing is pure Python, so only worker processes scale with cores; batches
+        # under medu_ingest.PARALLEL_MIN_BYTES are parsed in this process instead.
+        ingest_results = ingest_papyri(
+            ingest_manifest, per_medut_in, txt_files,
+            jobs=parse_jobs, pool="process", parse=partial(parse_medut_file, mode=parse_mode)
+        )
+        for idx, (filename, records, reparsed, seconds, error) in enumerate(ingest_results, start=1):
+            show_progress_sesh(idx, total_files, "Parsing glyph papyri")
+            file_path = os.path.join(per_medut_in, filename)
+            if error is not None:
+                logging.error(f"Isfet Kheper: Failed to read papyrus '{file_path}' - {error}")
+                continue
+            papyri_records.append(records)
+            if reparsed:
+                dirty_papyri.append(filename)
+                logging.info(f"Sesh medu: Parsed papyrus '{filename}' ({len(records)} signs) in {seconds * 1000:.1f} ms")
+        if dirty_papyri:
+            print("\nParse timings:")
+            for filename, records, reparsed, seconds, error in ingest_results:
+                if reparsed and error is None:
+                    print(f"  {filename}: {len(records)} signs in {seconds * 1000:.1f} ms")
+        prune_ingest_manifest(ingest_manifest, txt_files)
+        save_ingest_manifest(manifest_path, ingest_manifest)
+        structured_signs_medut = SignTable.from_records(chain.from_iterable(papyri_records))
+        parse_diagnostics = manifest_diagnostics(ingest_manifest, txt_files)
+        logging.info(f"Sesh medu: Reparsed {len(dirty_papyri)} of {total_files} papyri ({', '.join(dirty_papyri) or 'none'}).")
+    # Every export below reads unicode_escape/unicode_hex; derive them once, in bulk.
+    structured_signs_medut.derive_unicode()
+    diagnostics_path = os.path.join(per_medut_out, "Parse_Diagnostics.txt")
+    seal_medut_diagnostics(diagnostics_path, parse_diagnostics)
+    if parse_diagnostics:
+        print(f"\nIsfet Kheper: {len(parse_diagnostics)} papyrus lines need attention, see {diagnostics_path}")
+        logging.warning(f"Isfet Kheper: {len(parse_diagnostics)} parse diagnostics sealed at {diagnostics_path}")
+    print("\nThe Papyrus is Sealed: Parsing complete.")
+    logging.info("Ma’at Kheper: Parsing completed successfully.")
+
+    # --------------------------
+    # Change set against the previous build
+    # --------------------------
+    log_idle_time("Change set")
+    master_output = os.path.join(per_medut_in, "Signs_Master.json")
+    previous_signs = []
+    if os.path.exists(master_output):
+        try:
+            with open(master_output, 'r', encoding='utf-8') as f:
+                previous_signs = json.load(f)
+        except Exception as e:
+            logging.warning(f"Isfet Kheper: Could not read previous master ({master_output}) - {e}")
+    change_set = diff_catalogs(previous_signs, structured_signs_medut)
+    redraw_codes, touched_categories, removed_codes = affected_outputs(change_set)
+    changes_path = os.path.join(per_medut_out, "Signs_Changes.json")
+    seal_medut_json(changes_path, change_set)
+    if previous_signs:
+        print(summarize_change_set(change_set))
+        logging.info(summarize_change_set(change_set))
+    else:
+        # No baseline to diff against: every sign counts as added, so only draw PNGs that are missing.
+        redraw_codes = set()
+
+    # --------------------------
+    # Generate placeholder images with progress
+    # --------------------------
+    log_idle_time("Inscribing glyph images")
+    print(f"Inscribing glyph images for {len(structured_signs_medut)} signs...")
+    logging.info(f"Opening the Scroll: Generating {len(structured_signs_medut)} glyph images.")
+    for entry in tqdm(structured_signs_medut, desc="Inscribing glyph images"):
+        img_path = os.path.join(per_sesh_seshu, f"{entry['code']}.png")
+        if not os.path.exists(img_path) or entry["code"] in redraw_codes:
+            per_sesh_medut(entry["glyph"], img_path)
+
+    # --------------------------
+    # Export JSON and CSV
+    # --------------------------
+    log_idle_time("Export JSON and CSV")
+    seal_medut_json_stream(master_output, structured_signs_medut.records())
+    seal_medut_binary(binary_catalog_path(master_output), structured_signs_medut, master_output)
+    seal_medut_ndjson(ndjson_master_path(master_output), structured_signs_medut.records(), master_output)
+    seal_medut_mph(mph_path(master_output), structured_signs_medut, load_ndjson_index(ndjson_master_path(master_output))["codes"], master_output)
+    seal_prefix_index(prefix_index_path(master_output), structured_signs_medut, master_output)
+    seal_description_index(description_index_path(master_output), structured_signs_medut, master_output)
+    sqlite_output = os.path.join(per_medut_in, "Signs_Master.sqlite")
+    try:
+        seal_medut_sqlite(sqlite_output, structured_signs_medut)
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal SQLite catalog ({sqlite_output}) - {e}")
+    parquet_output = os.path.join(per_medut_in, "Signs_Master.parquet")
+    arrow_output = os.path.join(per_medut_in, "Signs_Master.arrow")
+    try:
+        seal_medut_columnar(parquet_output, arrow_output, structured_signs_medut)
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal Parquet/Arrow catalog - {e}")
+    gardiner_csv_output = os.path.join(per_medut_in, "Signs_Master_Gardiner.csv")
+    all_json_paths = [master_output]
+    all_csv_paths = [seal_gardiner_csv(gardiner_csv_output)]
+    for cat, rows in structured_signs_medut.category_rows().items():
+        cat_json_file, cat_csv_file = seal_category_papyri(cat, rows)
+        all_json_paths.append(cat_json_file)
+        all_csv_paths.append(cat_csv_file)
+    seal_category_index(output_folder_json, [
+        (cat, os.path.basename(category_papyrus_paths(cat)[0]), [structured_signs_medut.codes[i] for i in rows])
+        for cat, rows in structured_signs_medut.category_rows().items()
+    ], master_output)
+    all_json_paths.append(category_index_path(output_folder_json))
+
+    # --------------------------
+    # ZIP Archive
+    # --------------------------
+    log_idle_time("ZIP Archive")
+    zip_output = os.path.join(per_medut_in, "Signs_Archive.zip")
+    files_to_zip = [master_output] + all_json_paths + all_csv_paths
+    seal_kheper_archive(zip_output, files_to_zip)
+
+    # --------------------------
+    # Summary Report
+    # --------------------------
+    log_idle_time("Summary Report")
+    archive_size = os.path.getsize(zip_output) / (1024 * 1024) if os.path.exists(zip_output) else 0
+    rekh_summary_medut = (
+        "\n=== Medu neTcher Rekh ===\n"
+        f"Papyri sesh: {total_files}\n"
+        f"Medu neTcher inscribed: {len(structured_signs_medut)}\n"
+        f"Seshu kheper: {len(structured_signs_medut)}\n"
+        f"Per medu scrolls: 1\n"
+        f"Kheper archive: {archive_size:.2f} MB\n"
+        "========================\n"
+    )
+    print(rekh_summary_medut)
+    logging.info(rekh_summary_medut)
+    summary_path = os.path.join(per_medut_in, "Summary_Report.txt")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write(rekh_summary_medut)
+    logging.info(f"Sesh medu: Summary sealed at {summary_path}")
+
+    if args.watch:
+        if args.input_archive:
+            print("Watch mode needs an input folder, not --input_archive.")
+        else:
+            print(f"Watching {per_medut_in} for papyrus changes (Ctrl+C to stop)...")
+            logging.info(f"Opening the Scroll: Watch mode started on {per_medut_in}")
+            # Sniff verdicts keyed by size and mtime, so a poll only re-reads files that changed.
+            sniff_cache = {}
+            # One worker pool for the whole session; small saves are parsed in this process anyway.
+            watch_pool = ProcessPoolExecutor(max_workers=parse_jobs) if parse_jobs > 1 else None
+            try:
+                watch_papyri(
+                    per_medut_in,
+                    lambda: discover_papyri(per_medut_in, include=args.include, exclude=args.exclude, recursive=not args.no_recurse, sniff_cache=sniff_cache),
+                    partial(rebuild_changed_papyri, args=args, ingest_manifest=ingest_manifest, manifest_path=manifest_path,
+                            sniff_cache=sniff_cache, executor=watch_pool, zip_output=zip_output,
+                            sqlite_output=sqlite_output, parquet_output=parquet_output, arrow_output=arrow_output,
+                            gardiner_csv_output=gardiner_csv_output),
+                    interval=args.watch_interval,
+                    debounce=args.watch_debounce
+                )
+            finally:
+                if watch_pool is not None:
+                    watch_pool.shutdown()
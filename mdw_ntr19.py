@@ -4,11 +4,11 @@ import sys
 import json
 import csv
 import zipfile
-import re
 import logging
 import time
 from tqdm import tqdm
-from datasets import load_dataset
+from medu_parse import parse_medut_file
+from medu_discover import discover_papyri
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 import argparse
@@ -149,20 +149,12 @@ def seal_kheper_archive(zip_path, files):
     except Exception as e:
         logging.error(f"Isfet Kheper: Failed to seal archive ({zip_path}) - {e}")
 
-def gardiner_sort_key(code):
-    match = re.match(r"([A-Z]+)(\d+)?", code)
-    if match:
-        letter = match.group(1)
-        number = int(match.group(2)) if match.group(2) else 0
-        return (letter, number)
-    return (code, 0)
-
 # --- Main Processing ---
 
 log_idle_time("Parsing glyph papyri")
 structured_signs_medut = []
 seen_codes = set()
-txt_files = [f for f in os.listdir(per_medut_in) if f.lower().endswith(".txt")]
+txt_files = discover_papyri(per_medut_in)
 total_files = len(txt_files)
 print(f"Opening the Scroll: Parsing {total_files} papyri...")
 logging.info(f"Opening the Scroll: Parsing {total_files} text files.")
@@ -170,41 +162,13 @@ for idx, filename in enumerate(txt_files, start=1):
     show_progress_sesh(idx, total_files, "Parsing glyph papyri")
     file_path = os.path.join(per_medut_in, filename)
     try:
-        dataset = load_dataset('text', data_files=file_path)
-        lines = [row['text'].strip() for row in dataset['train'] if row['text'].strip()]
+        for entry in parse_medut_file(file_path):
+            if entry["code"] not in seen_codes:
+                structured_signs_medut.append(entry)
+                seen_codes.add(entry["code"])
     except Exception as e:
         logging.error(f"Isfet Kheper: Failed to read papyrus '{file_path}' - {e}")
         continue
-    current_category = None
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if "-" in line and not any(ch.isdigit() for ch in line):
-            current_category = line
-            i += 1
-            continue
-        if i + 1 < len(lines):
-            code = line
-            glyph_line = lines[i + 1]
-            description = ""
-            glyph_parts = glyph_line.split(maxsplit=1)
-            glyph = glyph_parts[0]
-            if len(glyph_parts) > 1:
-                description = glyph_parts[1]
-            unicode_escape = glyph.encode('unicode_escape').decode('utf-8')
-            hex_points = " ".join([f"U+{ord(ch):04X}" for ch in glyph])
-            entry = {
-                "category": current_category or filename.replace(".txt", ""),
-                "code": code,
-                "glyph": glyph,
-                "unicode_escape": unicode_escape,
-                "unicode_hex": hex_points,
-                "description": description
-            }
-            if code not in seen_codes:
-                structured_signs_medut.append(entry)
-                seen_codes.add(code)
-            i += 2
 print("\nThe Papyrus is Sealed: Parsing complete.")
 logging.info("Ma’at Kheper: Parsing completed successfully.")
 
@@ -0,0 +1,144 @@
+import io
+import os
+import base64
+import tarfile
+import zipfile
+import posixpath
+from medu_parse import iter_medut_stream, parse_medut_lines, parse_medut_grammar, default_category
+
+GLYPH_IMAGE_DIR = "glyph_images"
+
+
+class MedutSource:
+    """Read-only name -> member view shared by folders and archives."""
+
+    def names(self):
+        return list(self.members)
+
+    def exists(self, name):
+        return name in self.members
+
+    def open_text(self, name):
+        return io.TextIOWrapper(self.open_binary(name), encoding='utf-8')
+
+    def read_bytes(self, name):
+        with self.open_binary(name) as f:
+            return f.read()
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ZipSource(MedutSource):
+    """A zip archive; members are read in place via the central directory."""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'r')
+        self.members = {info.filename: info for info in self.archive.infolist() if not info.is_dir()}
+
+    def size(self, name):
+        return self.members[name].file_size
+
+    def open_binary(self, name):
+        return self.archive.open(self.members[name], 'r')
+
+    def close(self):
+        self.archive.close()
+
+
+class TarSource(MedutSource):
+    """A tar archive, optionally compressed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = tarfile.open(path, 'r:*')
+        self.members = {posixpath.normpath(member.name): member for member in self.archive.getmembers() if member.isfile()}
+
+    def size(self, name):
+        return self.members[name].size
+
+    def open_binary(self, name):
+        return self.archive.extractfile(self.members[name])
+
+    def close(self):
+        self.archive.close()
+
+
+class FolderSource(MedutSource):
+    """The same interface over a plain folder, so callers need not care where inputs live."""
+
+    def __init__(self, path):
+        self.path = path
+        self.members = {}
+        for root, dirs, files in os.walk(path):
+            rel_root = os.path.relpath(root, path)
+            for filename in files:
+                rel = filename if rel_root == "." else os.path.join(rel_root, filename)
+                self.members[rel.replace(os.sep, "/")] = os.path.join(root, filename)
+
+    def size(self, name):
+        return os.path.getsize(self.members[name])
+
+    def open_binary(self, name):
+        return open(self.members[name], 'rb')
+
+    def open_text(self, name):
+        return open(self.members[name], 'r', encoding='utf-8')
+
+
+def open_medut_source(path):
+    """Open a folder, zip or tar (.tar/.tar.gz/.tgz/...) as a read-only papyri source."""
+    if os.path.isdir(path):
+        return FolderSource(path)
+    if zipfile.is_zipfile(path):
+        return ZipSource(path)
+    if tarfile.is_tarfile(path):
+        return TarSource(path)
+    raise ValueError(f"Not a folder, zip or tar archive: {path}")
+
+
+def parse_source_papyrus(source, name, mode="stream", diagnostics=None):
+    """
+    Stream the sign records of one category .txt member without extracting it.
+    :param mode: 'stream' for the plain code/glyph pairing, 'grammar' for the line classifier
+    :param diagnostics: Optional list receiving lines that could not be paired
+    """
+    category = default_category(posixpath.basename(name))
+    with source.open_text(name) as f:
+        if mode == "grammar":
+            yield from parse_medut_grammar(f, category, name, diagnostics)
+        else:
+            yield from parse_medut_lines(iter_medut_stream(f), category, name, diagnostics)
+
+
+def glyph_image_index(source, image_dir=GLYPH_IMAGE_DIR):
+    """Map sign code -> member name for every <image_dir>/<code>.png in the source."""
+    index = {}
+    for name in source.names():
+        parent, filename = posixpath.split(name)
+        if posixpath.basename(parent) == image_dir and filename.lower().endswith(".png"):
+            index.setdefault(filename[:-4], name)
+    return index
+
+
+def read_glyph_image(source, index, code):
+    """Return a glyph PNG as an in-memory stream (for reportlab ImageReader / PIL), or None."""
+    name = index.get(code)
+    if name is None:
+        return None
+    return io.BytesIO(source.read_bytes(name))
+
+
+def glyph_data_uri(source, index, code):
+    """Return a glyph PNG as a data: URI for inline <img> tags in the HTML index, or None."""
+    name = index.get(code)
+    if name is None:
+        return None
+    return "data:image/png;base64," + base64.b64encode(source.read_bytes(name)).decode('ascii')
@@ -0,0 +1,290 @@
+import os
+import json
+import mmap
+import zlib
+import struct
+import logging
+from collections.abc import Mapping
+from medu_parse import glyph_unicode_escape, glyph_unicode_hex
+from medu_table import SignTable, SignRow
+from medu_stamp import source_stat, source_fresh
+
+# Signs_Master.medb layout (little endian):
+#   header   HEADER struct (magic, version, counts, source stat, section offsets)
+#   pool     UTF-8 strings end to end; identical strings are stored once
+#   categories  category_count x (offset, length) into the pool
+#   signs    sign_count x (code off, code len, glyph off, glyph len, desc off, desc len, category id)
+#   index    slot_count x u32 row + 1 (0 = empty), open addressing on crc32(code)
+CATALOG_MAGIC = b"MEDB"
+CATALOG_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQQQQQQ")
+CATEGORY = struct.Struct("<II")
+SIGN = struct.Struct("<IIIIIII")
+SLOT = struct.Struct("<I")
+
+
+def binary_catalog_path(json_path):
+    return os.path.splitext(json_path)[0] + ".medb"
+
+
+def code_slot(code_bytes, mask):
+    return zlib.crc32(code_bytes) & mask
+
+
+def pack_medut_binary(signs, source_size=0, source_mtime=0):
+    """
+    Serialise sign records (or SignTable rows) into the binary catalog layout.
+    :return: (catalog bytes, number of signs)
+    """
+    pool = bytearray()
+    pooled = {}
+
+    def intern(text):
+        data = text.encode('utf-8')
+        offset = pooled.get(data)
+        if offset is None:
+            offset = len(pool)
+            pool.extend(data)
+            pooled[data] = offset
+        return offset, len(data)
+
+    category_ids = {}
+    categories = bytearray()
+    rows = bytearray()
+    row_codes = []
+    for entry in signs:
+        category = entry["category"]
+        category_id = category_ids.get(category)
+        if category_id is None:
+            category_id = category_ids[category] = len(category_ids)
+            categories += CATEGORY.pack(*intern(category))
+        code_offset, code_length = intern(entry["code"])
+        glyph_offset, glyph_length = intern(entry["glyph"])
+        desc_offset, desc_length = intern(entry.get("description", ""))
+        rows += SIGN.pack(code_offset, code_length, glyph_offset, glyph_length, desc_offset, desc_length, category_id)
+        row_codes.append(entry["code"].encode('utf-8'))
+    if len(pool) > 0xFFFFFFFF:
+        raise ValueError("String pool exceeds 4 GB")
+
+    slot_count = 1
+    while slot_count < 2 * len(row_codes):
+        slot_count *= 2
+    mask = slot_count - 1
+    slots = [0] * slot_count
+    for row, code_bytes in enumerate(row_codes):
+        slot = code_slot(code_bytes, mask)
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = row + 1
+
+    pool_offset = HEADER.size
+    category_offset = pool_offset + len(pool)
+    sign_offset = category_offset + len(categories)
+    index_offset = sign_offset + len(rows)
+    header = HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, 0, len(row_codes), len(category_ids), slot_count,
+                         source_size, source_mtime, pool_offset, category_offset, sign_offset, index_offset)
+    return b"".join([header, pool, categories, rows, struct.pack(f"<{slot_count}I", *slots)]), len(row_codes)
+
+
+def seal_medut_binary(path, signs, source_path=None):
+    """
+    Write a binary catalog next to Signs_Master.json.
+    :param signs: Sign records or SignTable rows, in catalog order
+    :param source_path: The JSON the catalog mirrors; its size and mtime are
+                        stored so load_catalog can tell when the binary is stale
+    :return: Number of signs written
+    """
+    data, count = pack_medut_binary(signs, *source_stat(source_path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    logging.info(f"Sesh medu: Binary catalog sealed ({path}, {count} signs)")
+    return count
+
+
+def read_catalog_header(path):
+    """Return the header fields as a dict, or None if the file is not a readable catalog."""
+    try:
+        with open(path, 'rb') as f:
+            return parse_catalog_header(f.read(HEADER.size))
+    except OSError:
+        return None
+
+
+def parse_catalog_header(raw):
+    if len(raw) < HEADER.size:
+        return None
+    (magic, version, flags, sign_count, category_count, slot_count, source_size, source_mtime,
+     pool_offset, category_offset, sign_offset, index_offset) = HEADER.unpack_from(raw, 0)
+    if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+        return None
+    return {
+        "sign_count": sign_count, "category_count": category_count, "slot_count": slot_count,
+        "source_size": source_size, "source_mtime_ns": source_mtime,
+        "pool_offset": pool_offset, "category_offset": category_offset,
+        "sign_offset": sign_offset, "index_offset": index_offset
+    }
+
+
+def binary_catalog_fresh(binary_path, json_path):
+    """True when the binary catalog is valid and was built from json_path as it is now."""
+    header = read_catalog_header(binary_path)
+    if header is None:
+        return False
+    return source_fresh(header["source_size"], header["source_mtime_ns"], json_path)
+
+
+class BinaryCatalog:
+    """
+    Read-only view of a binary catalog through mmap (or any buffer holding
+    the same layout, e.g. shared memory). Opening only reads the header;
+    rows are decoded when asked for. Offers the read side of the SignTable
+    interface (len, iteration, find, rows as SignRow mappings).
+    """
+
+    def __init__(self, path, buffer=None):
+        self.path = path
+        self.file = None
+        if buffer is None:
+            self.file = open(path, 'rb')
+            buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mm = buffer
+        header = parse_catalog_header(buffer)
+        if header is None:
+            self.close()
+            raise ValueError(f"Not a version {CATALOG_VERSION} binary catalog: {path}")
+        self.header = header
+        self.pool_offset = header["pool_offset"]
+        self.sign_offset = header["sign_offset"]
+        self.index_offset = header["index_offset"]
+        self.mask = header["slot_count"] - 1
+        self.category_names = [self.text(*CATEGORY.unpack_from(self.mm, header["category_offset"] + i * CATEGORY.size))
+                               for i in range(header["category_count"])]
+
+    def close(self):
+        if self.file is not None:
+            self.mm.close()
+            self.file.close()
+        self.mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def text(self, offset, length):
+        start = self.pool_offset + offset
+        return str(self.mm[start:start + length], 'utf-8')
+
+    def sign(self, index):
+        return SIGN.unpack_from(self.mm, self.sign_offset + index * SIGN.size)
+
+    def __len__(self):
+        return self.header["sign_count"]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sign index out of range")
+        return SignRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SignRow(self, index)
+
+    def row_of(self, code):
+        """Row index for a code via the hash index, or None."""
+        code_bytes = code.encode('utf-8')
+        slot = code_slot(code_bytes, self.mask)
+        while True:
+            row = SLOT.unpack_from(self.mm, self.index_offset + slot * SLOT.size)[0]
+            if row == 0:
+                return None
+            code_offset, code_length = SIGN.unpack_from(self.mm, self.sign_offset + (row - 1) * SIGN.size)[:2]
+            start = self.pool_offset + code_offset
+            if self.mm[start:start + code_length] == code_bytes:
+                return row - 1
+            slot = (slot + 1) & self.mask
+
+    def __contains__(self, code):
+        return self.row_of(code) is not None
+
+    def find(self, code):
+        index = self.row_of(code)
+        return None if index is None else SignRow(self, index)
+
+    def category(self, index):
+        return self.category_names[self.sign(index)[6]]
+
+    def value(self, index, field):
+        code_offset, code_length, glyph_offset, glyph_length, desc_offset, desc_length, category_id = self.sign(index)
+        if field == "code":
+            return self.text(code_offset, code_length)
+        if field == "glyph":
+            return self.text(glyph_offset, glyph_length)
+        if field == "description":
+            return self.text(desc_offset, desc_length)
+        if field == "category":
+            return self.category_names[category_id]
+        if field == "unicode_escape":
+            return glyph_unicode_escape(self.text(glyph_offset, glyph_length))
+        if field == "unicode_hex":
+            return glyph_unicode_hex(self.text(glyph_offset, glyph_length))
+        raise KeyError(field)
+
+    def record(self, index):
+        code_offset, code_length, glyph_offset, glyph_length, desc_offset, desc_length, category_id = self.sign(index)
+        glyph = self.text(glyph_offset, glyph_length)
+        return {
+            "category": self.category_names[category_id],
+            "code": self.text(code_offset, code_length),
+            "glyph": glyph,
+            "unicode_escape": glyph_unicode_escape(glyph),
+            "unicode_hex": glyph_unicode_hex(glyph),
+            "description": self.text(desc_offset, desc_length)
+        }
+
+    def records(self, indices=None):
+        for index in range(len(self)) if indices is None else indices:
+            yield self.record(index)
+
+
+class CatalogGlyphs(Mapping):
+    """code -> glyph view over a catalog, a drop-in for the dict load_sign_map used to build."""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def __getitem__(self, code):
+        row = self.catalog.find(code)
+        if row is None:
+            raise KeyError(code)
+        return row["glyph"]
+
+    def __iter__(self):
+        for row in self.catalog:
+            yield row["code"]
+
+    def __len__(self):
+        return len(self.catalog)
+
+
+def load_catalog(json_path, binary_path=None):
+    """
+    Open the sign catalog for reading.
+    Uses the binary catalog (mmap, no parsing) when it matches json_path, and
+    falls back to json.load into a SignTable when it is missing or stale.
+    """
+    binary_path = binary_path or binary_catalog_path(json_path)
+    if binary_catalog_fresh(binary_path, json_path):
+        try:
+            return BinaryCatalog(binary_path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Isfet Kheper: Could not open binary catalog '{binary_path}' - {e}")
+    elif os.path.exists(binary_path):
+        logging.info(f"Sesh medu: Binary catalog '{binary_path}' is stale, reading {json_path}")
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return SignTable.from_records(json.load(f))
@@ -0,0 +1,118 @@
+import sys
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from medu_catalog import load_catalog
+
+# (first, last, name) for the blocks hieroglyphic text is drawn from, sorted by first.
+UNICODE_BLOCKS = (
+    (0x0000, 0x007F, "Basic Latin"),
+    (0xE000, 0xF8FF, "Private Use Area"),
+    (0x13000, 0x1342F, "Egyptian Hieroglyphs"),
+    (0x13430, 0x1345F, "Egyptian Hieroglyph Format Controls"),
+    (0x13460, 0x143FF, "Egyptian Hieroglyphs Extended-A"),
+    (0xF0000, 0xFFFFF, "Supplementary Private Use Area-A"),
+    (0x100000, 0x10FFFF, "Supplementary Private Use Area-B"),
+)
+BLOCK_STARTS = array('I', (first for first, last, name in UNICODE_BLOCKS))
+OTHER_BLOCK = "Other"
+
+
+def codepoint_block(codepoint):
+    """Name of the block a code point falls in (one bisection over the interval table), or 'Other'."""
+    position = bisect_right(BLOCK_STARTS, codepoint) - 1
+    if position >= 0:
+        first, last, name = UNICODE_BLOCKS[position]
+        if codepoint <= last:
+            return name
+    return OTHER_BLOCK
+
+
+class CodepointIndex:
+    """
+    Reverse lookup from rendered glyphs to sign codes. Single code point
+    glyphs live in a sorted array of code points with a parallel list of
+    codes, so each character costs one bisection. When several signs share a
+    code point they sit next to each other, first catalog row first.
+    Glyphs of more than one code point are matched longest first, keyed by
+    their first code point.
+    """
+
+    def __init__(self, glyph_codes):
+        """
+        :param glyph_codes: Iterable of (glyph, code) in catalog order
+        """
+        singles = []
+        self.sequences = {}
+        for row, (glyph, code) in enumerate(glyph_codes):
+            if len(glyph) == 1:
+                singles.append((ord(glyph), row, code))
+            elif glyph:
+                self.sequences.setdefault(ord(glyph[0]), []).append((glyph, code))
+        singles.sort()
+        self.codepoints = array('I', (codepoint for codepoint, row, code in singles))
+        self.codes = [code for codepoint, row, code in singles]
+        for candidates in self.sequences.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))
+
+    @classmethod
+    def from_catalog(cls, signs):
+        if hasattr(signs, "codes") and hasattr(signs, "glyphs"):
+            return cls(zip(signs.glyphs, signs.codes))
+        return cls((entry["glyph"], entry["code"]) for entry in signs)
+
+    def __len__(self):
+        return len(self.codes) + sum(len(candidates) for candidates in self.sequences.values())
+
+    def codes_for(self, codepoint):
+        """Every code whose glyph is exactly this code point, in catalog order."""
+        start = bisect_left(self.codepoints, codepoint)
+        end = bisect_right(self.codepoints, codepoint, start)
+        return self.codes[start:end]
+
+    def code_for(self, codepoint):
+        """The first code for a code point, or None."""
+        position = bisect_left(self.codepoints, codepoint)
+        if position < len(self.codepoints) and self.codepoints[position] == codepoint:
+            return self.codes[position]
+        return None
+
+    def decode(self, text):
+        """
+        Split hieroglyphic text back into signs.
+        :return: List of (glyph, code or None, block of its first code point)
+        """
+        decoded = []
+        position = 0
+        while position < len(text):
+            codepoint = ord(text[position])
+            for glyph, code in self.sequences.get(codepoint, ()):
+                if text.startswith(glyph, position):
+                    break
+            else:
+                glyph = text[position]
+                code = self.code_for(codepoint)
+            decoded.append((glyph, code, codepoint_block(codepoint)))
+            position += len(glyph)
+        return decoded
+
+    def decode_codes(self, text, unknown="?"):
+        """Codes for every sign in text; characters with no sign become unknown (format controls included)."""
+        return [unknown if code is None else code for glyph, code, block in self.decode(text)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode hieroglyphic text back into Gardiner sign codes.")
+    parser.add_argument('json', type=str, help="Signs_Master.json")
+    parser.add_argument('text', nargs='*', help="Text to decode (read from stdin when omitted)")
+    args = parser.parse_args()
+
+    index = CodepointIndex.from_catalog(load_catalog(args.json))
+    for text in args.text or [line.rstrip("\n") for line in sys.stdin]:
+        for glyph, code, block in index.decode(text):
+            hexes = " ".join(f"U+{ord(ch):04X}" for ch in glyph)
+            print(f"{hexes}\t{code or '-'}\t{block}")
+
+
+if __name__ == "__main__":
+    main()
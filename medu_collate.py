@@ -0,0 +1,111 @@
+import re
+from array import array
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Family letters (any case), sign number, variant suffix letters, extension number.
+# The number is required, so a suffix can only follow it: HIER001 is irregular,
+# not family HIE with suffix R.
+GARDINER_CODE = re.compile(r"([A-Za-z]{1,3})(\d+)([A-Za-z]{0,2})(\d*)")
+# Rank of a family's first letter. Aa (written AA or Aa in the papyri) comes after Z.
+LETTER_RANK = {letter: rank for rank, letter in enumerate("abcdefghijklmnopqrstuvwxyz", start=1)}
+AA_RANK = 27
+
+# Bit layout of a packed key, most significant first:
+# irregular flag (1) | family (15) | number (20) | suffix (10) | extension (16)
+EXTENSION_BITS = 16
+SUFFIX_BITS = 10
+NUMBER_BITS = 20
+FAMILY_BITS = 15
+SUFFIX_SHIFT = EXTENSION_BITS
+NUMBER_SHIFT = SUFFIX_SHIFT + SUFFIX_BITS
+FAMILY_SHIFT = NUMBER_SHIFT + NUMBER_BITS
+IRREGULAR = 1 << (FAMILY_SHIFT + FAMILY_BITS)
+
+
+@lru_cache(maxsize=None)
+def letters_value(letters):
+    """Letters as base-27 digits (a=1 .. z=26), so shorter sorts before longer: A < AA < AB < B."""
+    value = 0
+    for letter in letters:
+        value = value * 27 + LETTER_RANK[letter]
+    return value
+
+
+@lru_cache(maxsize=None)
+def family_value(family):
+    """
+    Gardiner family as an integer: first letter by rank, then up to two more
+    letters, so N < NL < NU < O and G < GE < GG < H. Case does not matter, so
+    the lowercase k of 'k Fishes' files with K, and Aa/AA sorts after Z.
+    """
+    family = family.lower()
+    if family == "aa":
+        return AA_RANK * 27 * 27
+    return LETTER_RANK[family[0]] * 27 * 27 + letters_value(family[1:]) * 27 ** (2 - len(family[1:]))
+
+
+@lru_cache(maxsize=None)
+def suffix_value(suffix):
+    """Variant suffix letters padded to two places: '' < A < AA < AB < B."""
+    return letters_value(suffix.lower()) * 27 ** (2 - len(suffix))
+
+
+def gardiner_key(code):
+    """
+    Packed integer collation key for a sign code, parsed once:
+    family, then number, then variant suffix (A1 < A1A < A1B < A2), then any
+    extension number (A1A < A1A1 < A1A2). Codes that do not fit the pattern
+    get the irregular flag and sort after every regular code.
+    """
+    match = GARDINER_CODE.fullmatch(code)
+    if match is None:
+        return IRREGULAR
+    family, number, suffix, extension = match.groups()
+    number = int(number)
+    extension = int(extension) if extension else 0
+    if number >> NUMBER_BITS or extension >> EXTENSION_BITS:
+        return IRREGULAR
+    return ((family_value(family) << FAMILY_SHIFT) | (number << NUMBER_SHIFT)
+            | (suffix_value(suffix) << SUFFIX_SHIFT) | extension)
+
+
+def gardiner_sort_key(code):
+    """Total Gardiner order: the packed key, with the raw code breaking ties (e.g. between irregular codes)."""
+    return (gardiner_key(code), code)
+
+
+def gardiner_keys(codes):
+    """Packed keys for a sequence of codes: a uint64 NumPy array, or array('Q') without NumPy."""
+    keys = array('Q', map(gardiner_key, codes))
+    return keys if np is None else np.frombuffer(keys, dtype=np.uint64)
+
+
+def gardiner_order(codes, keys=None):
+    """
+    Indices that put codes in Gardiner order (stable, raw code breaking ties).
+    With NumPy this is one argsort over the packed keys; ties, which only
+    come from irregular or differently written codes (AA1 / Aa1), are
+    resolved afterwards.
+    :param codes: Sequence of sign codes
+    :param keys: Precomputed gardiner_keys(codes), if the caller has them
+    :return: Index array (NumPy int64, or a list without NumPy)
+    """
+    codes = codes if isinstance(codes, (list, tuple)) else list(codes)
+    if keys is None:
+        keys = gardiner_keys(codes)
+    if np is None:
+        return sorted(range(len(codes)), key=lambda index: (keys[index], codes[index]))
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    equal = sorted_keys[1:] == sorted_keys[:-1]
+    if equal.any():
+        # Re-sort each run of equal keys by code; runs are short and rare.
+        bounds = np.flatnonzero(np.diff(np.concatenate(([False], equal, [False])).astype(np.int8)))
+        for start, end in zip(bounds[::2], bounds[1::2] + 1):
+            order[start:end] = sorted(order[start:end].tolist(), key=lambda index: codes[index])
+    return order
@@ -0,0 +1,108 @@
+import logging
+from medu_table import SignTable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def medut_arrow_schema():
+    return pa.schema([
+        ("category", pa.dictionary(pa.int32(), pa.string())),
+        ("code", pa.string()),
+        ("glyph", pa.string()),
+        ("codepoints", pa.list_(pa.int32())),
+        ("unicode_escape", pa.string()),
+        ("unicode_hex", pa.string()),
+        ("description", pa.string()),
+    ])
+
+
+def medut_arrow_table(signs):
+    """
+    Build an Arrow table straight from sign records (or a SignTable).
+    category is dictionary-encoded and codepoints holds each glyph's code
+    points as a list of integers.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)")
+    if isinstance(signs, SignTable):
+        # The table already holds interned category ids; reuse them as dictionary indices.
+        category_indices = pa.array(signs.categories, type=pa.int32())
+        category_names = list(signs.category_names)
+        rows = signs
+    else:
+        category_ids = {}
+        indices = []
+        seen_codes = set()
+        rows = []
+        for entry in signs:
+            # First record of a code wins, as in SignTable and the SQLite catalog.
+            if entry["code"] in seen_codes:
+                continue
+            seen_codes.add(entry["code"])
+            rows.append(entry)
+            indices.append(category_ids.setdefault(entry["category"], len(category_ids)))
+        category_indices = pa.array(indices, type=pa.int32())
+        category_names = list(category_ids)
+    codes = []
+    glyphs = []
+    codepoints = []
+    escapes = []
+    hexes = []
+    descriptions = []
+    for entry in rows:
+        glyph = entry["glyph"]
+        codes.append(entry["code"])
+        glyphs.append(glyph)
+        codepoints.append([ord(ch) for ch in glyph])
+        escapes.append(entry["unicode_escape"])
+        hexes.append(entry["unicode_hex"])
+        descriptions.append(entry.get("description", ""))
+    schema = medut_arrow_schema()
+    return pa.Table.from_arrays([
+        pa.DictionaryArray.from_arrays(category_indices, pa.array(category_names, type=pa.string())),
+        pa.array(codes, type=pa.string()),
+        pa.array(glyphs, type=pa.string()),
+        pa.array(codepoints, type=pa.list_(pa.int32())),
+        pa.array(escapes, type=pa.string()),
+        pa.array(hexes, type=pa.string()),
+        pa.array(descriptions, type=pa.string()),
+    ], schema=schema)
+
+
+def seal_medut_parquet(path, table):
+    pq.write_table(table, path, compression="zstd")
+    logging.info(f"Sesh medu: Catalog sealed in Parquet ({path}, {table.num_rows} signs)")
+
+
+def seal_medut_arrow(path, table):
+    """Arrow IPC file (Feather v2), uncompressed so readers can memory-map it."""
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    logging.info(f"Sesh medu: Catalog sealed in Arrow IPC ({path}, {table.num_rows} signs)")
+
+
+def seal_medut_columnar(parquet_path, arrow_path, signs):
+    """
+    Write the catalog as Parquet and as an Arrow IPC file from one Arrow table.
+    Logs a warning and writes nothing when pyarrow is not installed.
+    :return: Number of signs written, or None when skipped
+    """
+    if pa is None:
+        logging.warning("Isfet Kheper: pyarrow not installed, Parquet/Arrow export skipped.")
+        return None
+    table = medut_arrow_table(signs)
+    seal_medut_parquet(parquet_path, table)
+    seal_medut_arrow(arrow_path, table)
+    return table.num_rows
+
+
+def load_medut_arrow(path):
+    """Memory-map an Arrow IPC catalog; columns are read without copying."""
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
@@ -0,0 +1,124 @@
+from medu_parse import glyph_unicode_escape, glyph_unicode_hex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HEX_LOWER = b"0123456789abcdef"
+HEX_UPPER = b"0123456789ABCDEF"
+# Characters unicode_escape writes as a two-byte escape.
+SHORT_ESCAPES = {0x5C: ord("\\"), 0x09: ord("t"), 0x0A: ord("n"), 0x0D: ord("r")}
+
+
+def glyph_codepoints(glyphs):
+    """
+    All glyphs as one code point array plus offsets: glyph i is
+    codepoints[offsets[i]:offsets[i + 1]].
+    """
+    offsets = np.zeros(len(glyphs) + 1, dtype=np.int64)
+    np.cumsum([len(glyph) for glyph in glyphs], out=offsets[1:])
+    data = "".join(glyphs).encode('utf-32-le', 'surrogatepass')
+    return np.frombuffer(data, dtype='<u4').astype(np.int64), offsets
+
+
+def write_hex_digits(out, positions, values, width, table):
+    """Write values as width hex digits (most significant first) at positions."""
+    digits = np.frombuffer(table, dtype=np.uint8)
+    for j in range(width):
+        out[positions + j] = digits[(values >> (4 * (width - 1 - j))) & 0xF]
+
+
+def utf8_column_codepoints(data, byte_offsets):
+    """
+    Code points and per-glyph offsets for a StringColumn (UTF-8 bytes plus
+    byte offsets) without splitting it into strings first: a glyph's first
+    code point index is the number of UTF-8 lead bytes before it.
+    """
+    raw = np.frombuffer(bytes(data), dtype=np.uint8)
+    char_index = np.zeros(len(raw) + 1, dtype=np.int64)
+    np.cumsum((raw & 0xC0) != 0x80, out=char_index[1:])
+    offsets = char_index[np.frombuffer(byte_offsets, dtype=np.uint64).astype(np.int64)]
+    codepoints = np.frombuffer(bytes(data).decode('utf-8').encode('utf-32-le'), dtype='<u4').astype(np.int64)
+    return codepoints, offsets
+
+
+def split_ascii(packed):
+    """Decode packed output once and cut it back into one string per glyph."""
+    out, glyph_ends = packed
+    text = out.tobytes().decode('ascii')
+    glyph_ends = glyph_ends.tolist()
+    starts = [0] + glyph_ends[:-1]
+    return [text[start:end] for start, end in zip(starts, glyph_ends)]
+
+
+def bulk_unicode_escape(codepoints, offsets):
+    """
+    glyph.encode('unicode_escape').decode('utf-8') for every glyph at once.
+    :return: (packed ASCII bytes as uint8 array, byte offset where each glyph's text ends)
+    """
+    cp = codepoints
+    short = np.zeros(len(cp), dtype=np.uint8)
+    for ch, letter in SHORT_ESCAPES.items():
+        short[cp == ch] = letter
+    plain = (cp >= 0x20) & (cp < 0x7F) & (short == 0)
+    lengths = np.where(plain, 1, np.where(short > 0, 2, np.where(cp < 0x100, 4, np.where(cp < 0x10000, 6, 10))))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    out = np.empty(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+
+    out[starts[plain]] = cp[plain]
+    escaped = ~plain
+    out[starts[escaped]] = ord("\\")
+    is_short = short > 0
+    out[starts[is_short] + 1] = short[is_short]
+    for lo, hi, marker, width in ((0, 0x100, "x", 2), (0x100, 0x10000, "u", 4), (0x10000, 0x110000, "U", 8)):
+        mask = escaped & ~is_short & (cp >= lo) & (cp < hi)
+        out[starts[mask] + 1] = ord(marker)
+        write_hex_digits(out, starts[mask] + 2, cp[mask], width, HEX_LOWER)
+    return out, glyph_byte_ends(ends, offsets)
+
+
+def bulk_unicode_hex(codepoints, offsets):
+    """
+    " ".join(f"U+{ord(ch):04X}" for ch in glyph) for every glyph at once.
+    :return: Same packed form as bulk_unicode_escape
+    """
+    cp = codepoints
+    widths = 4 + (cp > 0xFFFF) + (cp > 0xFFFFF)
+    last = np.zeros(len(cp), dtype=bool)
+    glyph_lengths = np.diff(offsets)
+    last[offsets[1:][glyph_lengths > 0] - 1] = True
+    lengths = 2 + widths + ~last
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    out = np.empty(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+
+    out[starts] = ord("U")
+    out[starts + 1] = ord("+")
+    for width in (4, 5, 6):
+        mask = widths == width
+        write_hex_digits(out, starts[mask] + 2, cp[mask], width, HEX_UPPER)
+    out[(ends - 1)[~last]] = ord(" ")
+    return out, glyph_byte_ends(ends, offsets)
+
+
+def glyph_byte_ends(ends, offsets):
+    """Byte offset where each glyph's output ends (empty glyphs end where the previous one did)."""
+    padded = np.concatenate(([0], ends))
+    return padded[offsets[1:]]
+
+
+def derive_unicode_fields(glyphs):
+    """
+    unicode_escape and unicode_hex for a whole column of glyphs, computed with
+    NumPy over one code point array instead of per sign. Output matches
+    medut_record byte for byte. Falls back to the per-glyph functions when
+    NumPy is not installed.
+    :return: (escapes, hexes) as lists of str, in glyph order
+    """
+    glyphs = list(glyphs)
+    if np is None or not glyphs:
+        return [glyph_unicode_escape(glyph) for glyph in glyphs], [glyph_unicode_hex(glyph) for glyph in glyphs]
+    codepoints, offsets = glyph_codepoints(glyphs)
+    return split_ascii(bulk_unicode_escape(codepoints, offsets)), split_ascii(bulk_unicode_hex(codepoints, offsets))
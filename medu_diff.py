@@ -0,0 +1,166 @@
+import json
+import argparse
+
+# unicode_escape / unicode_hex are derived from glyph, so they are not compared separately.
+DIFF_FIELDS = ("glyph", "description")
+
+
+def diff_catalogs(old_signs, new_signs):
+    """
+    Hash-join two catalogs on code in O(n) and return a change set.
+    Either side may be a list of dicts or a medu_table.SignTable.
+    :return: dict with 'added' and 'removed' records, 'changed' entries
+             ({code, category, fields: {field: [old, new]}}), 'moved' entries
+             ({code, from, to}) and 'reordered' categories whose sign order changed
+    """
+    old_by_code = {}
+    for entry in old_signs:
+        old_by_code.setdefault(entry["code"], entry)
+    new_by_code = {}
+    for entry in new_signs:
+        new_by_code.setdefault(entry["code"], entry)
+
+    added = []
+    changed = []
+    moved = []
+    for code, entry in new_by_code.items():
+        before = old_by_code.get(code)
+        if before is None:
+            added.append(dict(entry))
+            continue
+        fields = {field: [before.get(field), entry.get(field)]
+                  for field in DIFF_FIELDS if before.get(field) != entry.get(field)}
+        if fields:
+            changed.append({"code": code, "category": entry["category"], "fields": fields})
+        if before["category"] != entry["category"]:
+            moved.append({"code": code, "from": before["category"], "to": entry["category"]})
+    removed = [dict(entry) for code, entry in old_by_code.items() if code not in new_by_code]
+
+    old_order = {}
+    new_order = {}
+    for entry in old_by_code.values():
+        old_order.setdefault(entry["category"], []).append(entry["code"])
+    for entry in new_by_code.values():
+        new_order.setdefault(entry["category"], []).append(entry["code"])
+    reordered = sorted(cat for cat in set(old_order) & set(new_order)
+                       if old_order[cat] != new_order[cat]
+                       and sorted(old_order[cat]) == sorted(new_order[cat]))
+
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "moved": moved,
+        "reordered": reordered,
+        "summary": {
+            "old_signs": len(old_by_code),
+            "new_signs": len(new_by_code),
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "moved": len(moved),
+            "reordered": len(reordered)
+        }
+    }
+
+
+def is_empty_change_set(change_set):
+    return not any(change_set[key] for key in ("added", "removed", "changed", "moved", "reordered"))
+
+
+def affected_outputs(change_set):
+    """
+    What a change set forces to be regenerated.
+    :return: (glyph_codes, categories, removed_codes): codes whose PNG must be
+             redrawn, categories whose JSON/CSV/PDF pages must be rewritten,
+             and codes whose outputs should be deleted
+    """
+    glyph_codes = {entry["code"] for entry in change_set["added"]}
+    categories = {entry["category"] for entry in change_set["added"]}
+    for item in change_set["changed"]:
+        if "glyph" in item["fields"]:
+            glyph_codes.add(item["code"])
+        categories.add(item["category"])
+    for item in change_set["moved"]:
+        categories.add(item["from"])
+        categories.add(item["to"])
+    for entry in change_set["removed"]:
+        categories.add(entry["category"])
+    categories.update(change_set["reordered"])
+    removed_codes = {entry["code"] for entry in change_set["removed"]}
+    return glyph_codes, categories, removed_codes
+
+
+def affected_exports(change_set):
+    """
+    Which global exports a change set forces to be rebuilt.
+    'catalog' (master JSON, binary catalog, NDJSON with the perfect-hash file
+    that points into it, SQLite, Parquet/Arrow) holds every field in catalog
+    order, so any change rewrites it. 'prefix' holds only codes and glyphs;
+    'search' holds codes and descriptions by catalog row.
+    :return: Set of 'catalog', 'prefix' and 'search'
+    """
+    if is_empty_change_set(change_set):
+        return set()
+    exports = {"catalog"}
+    codes_changed = bool(change_set["added"] or change_set["removed"])
+    fields = {field for item in change_set["changed"] for field in item["fields"]}
+    if codes_changed or "glyph" in fields:
+        exports.add("prefix")
+    if codes_changed or "description" in fields or change_set["moved"] or change_set["reordered"]:
+        exports.add("search")
+    return exports
+
+
+def summarize_change_set(change_set, limit=20):
+    """Human-readable summary of a change set."""
+    s = change_set["summary"]
+    lines = [
+        "=== Medu neTcher Changes ===",
+        f"Signs: {s['old_signs']} -> {s['new_signs']}",
+        f"Added: {s['added']}  Removed: {s['removed']}  Changed: {s['changed']}  "
+        f"Moved: {s['moved']}  Reordered categories: {s['reordered']}",
+    ]
+
+    def section(title, items, fmt):
+        if not items:
+            return
+        lines.append(f"\n{title}:")
+        for item in items[:limit]:
+            lines.append("  " + fmt(item))
+        if len(items) > limit:
+            lines.append(f"  ... and {len(items) - limit} more")
+
+    section("Added", change_set["added"], lambda e: f"+ {e['code']} {e['glyph']} [{e['category']}] {e.get('description', '')}".rstrip())
+    section("Removed", change_set["removed"], lambda e: f"- {e['code']} {e['glyph']} [{e['category']}]")
+    section("Changed", change_set["changed"], lambda c: f"~ {c['code']}: " + "; ".join(
+        f"{field} {old!r} -> {new!r}" for field, (old, new) in c["fields"].items()))
+    section("Moved", change_set["moved"], lambda m: f"> {m['code']}: {m['from']} -> {m['to']}")
+    section("Reordered", change_set["reordered"], lambda cat: f"= {cat}")
+    lines.append("============================")
+    return "\n".join(lines) + "\n"
+
+
+def load_signs(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two Signs_Master.json builds.")
+    parser.add_argument('old', type=str, help="Previous Signs_Master.json")
+    parser.add_argument('new', type=str, help="New Signs_Master.json")
+    parser.add_argument('--output', type=str, help="Write the change set as JSON to this file")
+    parser.add_argument('--limit', type=int, default=20, help="Items listed per section in the summary")
+    args = parser.parse_args()
+
+    change_set = diff_catalogs(load_signs(args.old), load_signs(args.new))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(change_set, f, ensure_ascii=False, indent=2)
+        print(f"Change set written to {args.output}")
+    print(summarize_change_set(change_set, args.limit))
+
+
+if __name__ == "__main__":
+    main()
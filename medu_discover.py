@@ -0,0 +1,152 @@
+import os
+import re
+import logging
+from fnmatch import fnmatchcase
+from medu_parse import is_category_header
+
+DEFAULT_INCLUDE = ["*.txt"]
+# The pipeline's own outputs and scratch files that live next to the papyri.
+DEFAULT_EXCLUDE = [
+    "Summary_Report.txt",
+    "complete_catalog.txt",
+    "process_log.txt",
+    "README.txt",
+    "test*.txt",
+]
+# Folders the pipeline writes into; never descend into them.
+OUTPUT_DIRS = {"glyph_images", "signs_by_category_json", "signs_by_category_csv"}
+
+GARDINER_CODE = re.compile(r"^[A-Za-z]+\d+[A-Za-z]*$")
+SNIFF_LINES = 12
+
+
+def matches_any(rel_path, patterns):
+    """Case-insensitive glob match against the file name or its relative path."""
+    rel_path = rel_path.replace(os.sep, "/").lower()
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        pattern = pattern.replace(os.sep, "/").lower()
+        if fnmatchcase(name, pattern) or fnmatchcase(rel_path, pattern):
+            return True
+    return False
+
+
+def sniff_lines(lines, max_lines=SNIFF_LINES):
+    """
+    Peek at the first non-empty lines and decide whether this is a sign list.
+    A sign list has a category header ('A - Man') or a line starting with a
+    Gardiner code ('A1', 'Aa15', 'A1A', 'R1,') near the top.
+    """
+    seen = 0
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if is_category_header(line) or GARDINER_CODE.match(line.split()[0].rstrip(",")):
+            return True
+        seen += 1
+        if seen >= max_lines:
+            break
+    return False
+
+
+def sniff_papyrus(file_path, max_lines=SNIFF_LINES):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return sniff_lines(f, max_lines)
+    except (OSError, UnicodeDecodeError) as e:
+        logging.warning(f"Isfet Kheper: Could not sniff papyrus '{file_path}' - {e}")
+    return False
+
+
+def sniff_entry(entry, cache=None, max_lines=SNIFF_LINES):
+    """sniff_papyrus for a scandir entry; with a cache, the verdict is reused while size and mtime are unchanged."""
+    if cache is None:
+        return sniff_papyrus(entry.path, max_lines)
+    try:
+        stat = entry.stat()
+    except OSError:
+        return False
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = cache.get(entry.path)
+    if cached is None or cached[0] != key:
+        cached = cache[entry.path] = (key, sniff_papyrus(entry.path, max_lines))
+    return cached[1]
+
+
+def discover_papyri(folder, include=None, exclude=None, recursive=True, sniff=True, sniff_cache=None):
+    """
+    Find the category sign lists under folder.
+    :param folder: Input folder (per_medut_in)
+    :param include: Glob patterns a file must match (default: *.txt)
+    :param exclude: Glob patterns that reject a file (default: the pipeline's own outputs)
+    :param recursive: Descend into sub-folders, skipping output folders and hidden ones
+    :param sniff: Reject files whose opening lines do not look like a sign list
+    :param sniff_cache: Optional dict kept between calls (watch mode) so unchanged
+                        files are not re-read
+    :return: Paths relative to folder, sorted case-insensitively
+    """
+    include = DEFAULT_INCLUDE if include is None else include
+    exclude = DEFAULT_EXCLUDE if exclude is None else exclude
+    found = []
+    skipped = []
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        try:
+            with os.scandir(os.path.join(folder, rel_dir)) as it:
+                entries = list(it)
+        except OSError as e:
+            logging.warning(f"Isfet Kheper: Could not scan '{os.path.join(folder, rel_dir)}' - {e}")
+            continue
+        for entry in entries:
+            rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if recursive and entry.name not in OUTPUT_DIRS and not entry.name.startswith("."):
+                    pending.append(rel_path)
+                continue
+            if not entry.is_file() or not matches_any(rel_path, include):
+                continue
+            if matches_any(rel_path, exclude) or (sniff and not sniff_entry(entry, sniff_cache)):
+                skipped.append(rel_path)
+                continue
+            found.append(rel_path)
+    found.sort(key=str.casefold)
+    if skipped:
+        logging.info(f"Sesh medu: Skipped {len(skipped)} non-catalog files ({', '.join(sorted(skipped, key=str.casefold))}).")
+    return found
+
+
+def sniff_member(source, name, max_lines=SNIFF_LINES):
+    try:
+        with source.open_text(name) as f:
+            return sniff_lines(f, max_lines)
+    except (OSError, UnicodeDecodeError) as e:
+        logging.warning(f"Isfet Kheper: Could not sniff papyrus '{name}' - {e}")
+    return False
+
+
+def discover_source_papyri(source, include=None, exclude=None, sniff=True):
+    """
+    Same rules as discover_papyri for the members of a medu_archive source
+    (a zip or tar read in place).
+    :return: Member names, sorted case-insensitively
+    """
+    include = DEFAULT_INCLUDE if include is None else include
+    exclude = DEFAULT_EXCLUDE if exclude is None else exclude
+    found = []
+    skipped = []
+    for name in source.names():
+        parts = name.split("/")
+        if any(part in OUTPUT_DIRS or part.startswith(".") for part in parts[:-1]):
+            continue
+        if not matches_any(name, include):
+            continue
+        if matches_any(name, exclude) or (sniff and not sniff_member(source, name)):
+            skipped.append(name)
+            continue
+        found.append(name)
+    found.sort(key=str.casefold)
+    if skipped:
+        logging.info(f"Sesh medu: Skipped {len(skipped)} non-catalog members ({', '.join(sorted(skipped, key=str.casefold))}).")
+    return found
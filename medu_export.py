@@ -0,0 +1,53 @@
+import csv
+import json
+import logging
+
+
+def seal_medut_csv_stream(path, records):
+    """Write records in the category CSV layout (header row, then one row per sign), one row at a time."""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Category", "Code", "Glyph", "Unicode Escape", "Unicode Hex", "Description"])
+        for entry in records:
+            writer.writerow([entry["category"], entry["code"], entry["glyph"], entry["unicode_escape"], entry["unicode_hex"], entry["description"]])
+            count += 1
+    logging.info(f"Sesh medu: Papyrus sealed in CSV ({path}, {count} signs)")
+    return count
+
+
+def seal_medut_catalog_stream(path, records):
+    """
+    Write records as complete_catalog.txt, one line (code, glyph, description) at a time.
+    A '=== category ===' header opens every run of signs from one category.
+    """
+    count = 0
+    category = None
+    with open(path, 'w', encoding='utf-8') as out:
+        for entry in records:
+            cat = entry.get("category", "Uncategorized")
+            if count == 0 or cat != category:
+                if count:
+                    out.write("\n")
+                out.write(f"=== {cat} ===\n")
+                category = cat
+            out.write(f"{entry['code']}\t{entry['glyph']}\t{entry.get('description', '')}\n")
+            count += 1
+        if count:
+            out.write("\n")
+    logging.info(f"Sesh medu: Catalog sealed ({path}, {count} signs)")
+    return count
+
+
+def seal_medut_json_stream(path, records):
+    """Write records as the same indent=2 JSON array as seal_medut_json, one record at a time."""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in records:
+            f.write("[\n" if count == 0 else ",\n")
+            body = json.dumps(entry, ensure_ascii=False, indent=2)
+            f.write("\n".join("  " + line for line in body.split("\n")))
+            count += 1
+        f.write("\n]" if count else "[]")
+    logging.info(f"Sesh medu: Papyrus sealed in JSON ({path}, {count} signs)")
+    return count
@@ -0,0 +1,168 @@
+import os
+import json
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from medu_parse import parse_medut_file
+
+MANIFEST_VERSION = 2
+# Below this many dirty bytes, starting workers costs more than parsing in this process.
+PARALLEL_MIN_BYTES = 4 << 20
+
+
+def new_ingest_manifest(parser="stream"):
+    return {"version": MANIFEST_VERSION, "parser": parser, "files": {}}
+
+
+def load_ingest_manifest(manifest_path, parser="stream"):
+    """
+    Load the ingest manifest, or start an empty one if it is missing or stale.
+    Records cached by a different parser mode are discarded.
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION and manifest.get("parser", "stream") == parser:
+            return manifest
+        logging.warning(f"Isfet Kheper: Ingest manifest version or parser mismatch ({manifest_path}), reparsing all papyri.")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Isfet Kheper: Unreadable ingest manifest ({manifest_path}) - {e}")
+    return new_ingest_manifest(parser)
+
+
+def save_ingest_manifest(manifest_path, manifest):
+    try:
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+        logging.info(f"Sesh medu: Ingest manifest sealed ({manifest_path})")
+    except Exception as e:
+        logging.error(f"Isfet Kheper: Failed to seal ingest manifest ({manifest_path}) - {e}")
+
+
+def hash_papyrus(file_path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_papyrus(manifest, file_path, key):
+    """
+    Compare a papyrus against its manifest entry.
+    :return: (records, None) when clean, or (None, fingerprint) when it must be reparsed
+    """
+    stat = os.stat(file_path)
+    cached = manifest["files"].get(key)
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["records"], None
+    content_hash = hash_papyrus(file_path)
+    if cached and cached["sha256"] == content_hash:
+        cached["size"] = stat.st_size
+        cached["mtime_ns"] = stat.st_mtime_ns
+        return cached["records"], None
+    return None, {
+        "path": file_path,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": content_hash
+    }
+
+
+def record_papyrus(manifest, key, fingerprint, records, diagnostics=()):
+    manifest["files"][key] = dict(fingerprint, records=records, diagnostics=list(diagnostics))
+
+
+def timed_parse(file_path, parse=parse_medut_file):
+    """
+    Parse one papyrus fully.
+    :param parse: Called as parse(file_path, diagnostics=list)
+    :return: (records, diagnostics, seconds)
+    """
+    start = time.perf_counter()
+    diagnostics = []
+    records = list(parse(file_path, diagnostics=diagnostics))
+    return records, diagnostics, time.perf_counter() - start
+
+
+def ingest_papyri(manifest, folder, filenames, jobs=1, pool="thread", parse=parse_medut_file,
+                  executor=None, parallel_min_bytes=PARALLEL_MIN_BYTES):
+    """
+    Bring every papyrus in filenames up to date, parsing the dirty ones concurrently.
+    :param manifest: Manifest dict from load_ingest_manifest (updated in place)
+    :param folder: Folder holding the category .txt files
+    :param filenames: Papyri in the order their records should be merged
+    :param jobs: Number of workers; 1 parses sequentially in this process
+    :param pool: 'thread' or 'process' ('process' needs a __main__ guard on Windows)
+    :param parse: Parser used for dirty files (must be picklable for 'process')
+    :param executor: Long-lived executor to use instead of starting a pool per
+                     call (watch mode); jobs and pool are then ignored
+    :param parallel_min_bytes: Dirty papyri smaller than this in total are
+                               parsed sequentially in this process
+    :return: List of (filename, records, reparsed, seconds, error) in filenames order
+    """
+    results = {}
+    dirty = []
+    for filename in filenames:
+        file_path = os.path.join(folder, filename)
+        try:
+            records, fingerprint = check_papyrus(manifest, file_path, filename)
+        except OSError as e:
+            results[filename] = (filename, None, False, 0.0, e)
+            continue
+        if fingerprint is None:
+            results[filename] = (filename, records, False, 0.0, None)
+        else:
+            dirty.append((filename, file_path, fingerprint))
+
+    def finish(filename, fingerprint, outcome):
+        try:
+            records, diagnostics, seconds = outcome()
+        except Exception as e:
+            results[filename] = (filename, None, True, 0.0, e)
+            return
+        record_papyrus(manifest, filename, fingerprint, records, diagnostics)
+        results[filename] = (filename, records, True, seconds, None)
+
+    def collect(executor):
+        futures = [(filename, fingerprint, executor.submit(timed_parse, file_path, parse))
+                   for filename, file_path, fingerprint in dirty]
+        for filename, fingerprint, future in futures:
+            finish(filename, fingerprint, future.result)
+
+    dirty_bytes = sum(fingerprint["size"] for filename, file_path, fingerprint in dirty)
+    if len(dirty) > 1 and dirty_bytes >= parallel_min_bytes and (executor is not None or jobs > 1):
+        if executor is not None:
+            collect(executor)
+        else:
+            executor_cls = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+            with executor_cls(max_workers=min(jobs, len(dirty))) as owned:
+                collect(owned)
+    else:
+        for filename, file_path, fingerprint in dirty:
+            finish(filename, fingerprint, lambda: timed_parse(file_path, parse))
+    return [results[filename] for filename in filenames]
+
+
+def manifest_diagnostics(manifest, keys):
+    """Grammar diagnostics for keys, including those cached for unchanged papyri."""
+    diagnostics = []
+    for key in keys:
+        entry = manifest["files"].get(key)
+        if entry:
+            diagnostics.extend(tuple(item) for item in entry.get("diagnostics", []))
+    return diagnostics
+
+
+def prune_ingest_manifest(manifest, keys):
+    """Forget papyri that are no longer part of the input set."""
+    keep = set(keys)
+    for key in [k for k in manifest["files"] if k not in keep]:
+        del manifest["files"][key]
+        logging.info(f"Sesh medu: Papyrus '{key}' dropped from ingest manifest.")
+
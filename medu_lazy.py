@@ -0,0 +1,160 @@
+import os
+import re
+import json
+import logging
+from collections import OrderedDict, Counter
+from medu_stamp import source_stat, source_fresh
+
+CATEGORY_INDEX = "Category_Index.json"
+CATEGORY_INDEX_VERSION = 1
+CODE_PREFIX = re.compile(r"[A-Za-z]+")
+
+
+def code_prefix(code):
+    """Gardiner family letters of a code: 'G17' -> 'G', 'Aa15' -> 'Aa', 'NL3' -> 'NL'."""
+    match = CODE_PREFIX.match(code)
+    return match.group(0) if match else code
+
+
+def category_index_path(json_dir):
+    return os.path.join(json_dir, CATEGORY_INDEX)
+
+
+def build_category_index(category_signs):
+    """
+    :param category_signs: Iterable of (category, json filename, codes)
+    :return: Index dict: category -> file, category -> sign count, and code
+             prefix -> files ordered by how many of the prefix's codes they
+             hold (most first)
+    """
+    categories = {}
+    sizes = {}
+    prefix_counts = {}
+    for category, filename, codes in category_signs:
+        categories[category] = filename
+        sizes[category] = len(codes)
+        for code in codes:
+            prefix_counts.setdefault(code_prefix(code), Counter())[filename] += 1
+    return {
+        "version": CATEGORY_INDEX_VERSION,
+        "categories": categories,
+        "signs": sizes,
+        "prefixes": {prefix: [filename for filename, count in counts.most_common()]
+                     for prefix, counts in sorted(prefix_counts.items())}
+    }
+
+
+def seal_category_index(json_dir, category_signs, source_path=None):
+    """
+    Write Category_Index.json next to the per-category JSON files.
+    :param source_path: The master JSON the category files were split from;
+                        its size and mtime mark the index as fresh
+    """
+    index = build_category_index(category_signs)
+    index["source_size"], index["source_mtime_ns"] = source_stat(source_path)
+    path = category_index_path(json_dir)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+    logging.info(f"Sesh medu: Category index sealed ({path}, {len(index['prefixes'])} prefixes)")
+    return index
+
+
+def scan_category_index(json_dir):
+    """Rebuild the index by reading every category file (used when Category_Index.json is missing)."""
+    category_signs = []
+    for filename in sorted(os.listdir(json_dir), key=str.casefold):
+        if not filename.lower().endswith(".json") or filename == CATEGORY_INDEX:
+            continue
+        try:
+            with open(os.path.join(json_dir, filename), 'r', encoding='utf-8') as f:
+                signs = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Isfet Kheper: Could not read category papyrus '{filename}' - {e}")
+            continue
+        if isinstance(signs, list) and signs and isinstance(signs[0], dict) and "code" in signs[0]:
+            category_signs.append((signs[0]["category"], filename, [entry["code"] for entry in signs]))
+    return build_category_index(category_signs)
+
+
+def category_index_fresh(json_dir, json_path):
+    """True when Category_Index.json is valid and was sealed from json_path as it is now."""
+    try:
+        with open(category_index_path(json_dir), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if index.get("version") != CATEGORY_INDEX_VERSION:
+        return False
+    return source_fresh(index.get("source_size"), index.get("source_mtime_ns"), json_path)
+
+
+def load_category_index(json_dir):
+    try:
+        with open(category_index_path(json_dir), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") == CATEGORY_INDEX_VERSION:
+            return index
+    except (OSError, ValueError) as e:
+        logging.info(f"Sesh medu: No category index in {json_dir}, scanning category papyri - {e}")
+    return scan_category_index(json_dir)
+
+
+class LazyCatalog:
+    """
+    Sign lookups over signs_by_category_json that read only the category
+    files a request touches. A code's prefix selects its candidate files via
+    Category_Index.json; loaded partitions (code -> record) are kept in an
+    LRU cache of max_partitions entries.
+    """
+
+    def __init__(self, json_dir, max_partitions=8):
+        self.json_dir = json_dir
+        self.max_partitions = max_partitions
+        self.index = load_category_index(json_dir)
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+
+    def partition(self, filename):
+        """code -> record for one category file, loaded on first use."""
+        partition = self.cache.get(filename)
+        if partition is not None:
+            self.cache.move_to_end(filename)
+            self.hits += 1
+            return partition
+        partition = {}
+        with open(os.path.join(self.json_dir, filename), 'r', encoding='utf-8') as f:
+            for entry in json.load(f):
+                partition.setdefault(entry["code"], entry)
+        self.loads += 1
+        self.cache[filename] = partition
+        if len(self.cache) > self.max_partitions:
+            self.cache.popitem(last=False)
+        return partition
+
+    def find(self, code):
+        """The record for a code, or None; loads candidate partitions most-likely first."""
+        for filename in self.index["prefixes"].get(code_prefix(code), []):
+            entry = self.partition(filename).get(code)
+            if entry is not None:
+                return entry
+        return None
+
+    def __contains__(self, code):
+        return self.find(code) is not None
+
+    def categories(self):
+        return list(self.index["categories"])
+
+    def category(self, category):
+        """Records of one category, in file order."""
+        filename = self.index["categories"].get(category)
+        return [] if filename is None else list(self.partition(filename).values())
+
+    def __iter__(self):
+        for category in self.index["categories"]:
+            yield from self.category(category)
+
+    def __len__(self):
+        return sum(self.index["signs"].values())
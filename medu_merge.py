@@ -0,0 +1,231 @@
+import os
+import re
+import json
+import heapq
+import pickle
+import logging
+import tempfile
+from itertools import islice, chain
+import argparse
+from medu_archive import open_medut_source, parse_source_papyrus
+from medu_discover import discover_source_papyri
+from medu_collate import gardiner_sort_key, gardiner_order
+from medu_export import seal_medut_json_stream
+
+
+JSON_SPACE = re.compile(r"[\s,]*")
+JSON_ITEM_END = frozenset(",] \t\r\n")
+
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """
+    Yield the items of a top-level JSON array (such as Signs_Master.json)
+    one at a time, reading f in chunks, so the array is never held whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array")
+    position = 1
+    at_eof = False
+    while True:
+        position = JSON_SPACE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+            # A number cut off by the chunk boundary ("[12" of "[12345",
+            # "[-0." of "[-0.25") still decodes; trust an item only once the
+            # separator after it has been read.
+            complete = at_eof or (end < len(buffer) and buffer[end] in JSON_ITEM_END)
+        except json.JSONDecodeError:
+            if at_eof:
+                raise
+            complete = False
+        if not complete:
+            chunk = f.read(chunk_size)
+            at_eof = not chunk
+            # Keep the unread tail and retry with more text.
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
+        position = end
+
+
+def source_records(source):
+    """
+    Every record of one source in its own priority order: the category papyri
+    one after another (file order, then line order), or the Signs_Master.json
+    streamed item by item when the source holds no papyri.
+    """
+    names = discover_source_papyri(source)
+    if names:
+        for name in names:
+            yield from parse_source_papyrus(source, name)
+        return
+    if source.exists("Signs_Master.json"):
+        with source.open_text("Signs_Master.json") as f:
+            yield from iter_json_array(f)
+        return
+    logging.warning(f"Isfet Kheper: No papyri or Signs_Master.json in source '{source.path}'.")
+
+
+def ranked_records(records, source_rank):
+    """Tag records of one Gardiner-sorted source with their merge order."""
+    for entry in records:
+        yield (gardiner_sort_key(entry["code"]), source_rank), entry
+
+
+class JsonFileSource:
+    """A bare Signs_Master.json used as a merge source."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def names(self):
+        return ["Signs_Master.json"]
+
+    def exists(self, name):
+        return name == "Signs_Master.json"
+
+    def open_text(self, name):
+        return open(self.path, 'r', encoding='utf-8')
+
+    def close(self):
+        pass
+
+
+def open_merge_source(path):
+    if os.path.isfile(path) and path.lower().endswith(".json"):
+        return JsonFileSource(path)
+    return open_medut_source(path)
+
+
+def merge_sources(paths, conflicts=None, stats=None, run_size=200000, tmp_dir=None):
+    """
+    k-way heap merge of N sources into one Gardiner-ordered stream.
+    Earlier paths win: when several sources define a code, the record from
+    the lowest-numbered source is kept and the others are dropped.
+    Each source is read once, as a stream, and put in Gardiner order by
+    gardiner_sorted (runs of run_size spilled to tmp_dir), so memory holds at
+    most one run per source, never the whole union. Conflicts and duplicate
+    counts are collected in the same pass.
+    :param paths: Sources in priority order (overrides first, base last)
+    :param conflicts: Optional list that receives (code, winning_source, losing_source)
+    :param stats: Optional dict that receives per-source counts of signs read
+                  and kept, duplicates dropped inside a source, and conflicts
+    :return: Generator of sign records in Gardiner order
+    """
+    sources = []
+    if stats is not None:
+        stats.update(read=[0] * len(paths), kept=[0] * len(paths), duplicates=0, conflicts=0)
+    try:
+        streams = []
+        for source_rank, path in enumerate(paths):
+            source = open_merge_source(path)
+            sources.append(source)
+            streams.append(ranked_records(gardiner_sorted(source_records(source), run_size, tmp_dir), source_rank))
+
+        last_code = None
+        winner_rank = None
+        for (key, source_rank), entry in heapq.merge(*streams, key=lambda item: item[0]):
+            code = entry["code"]
+            if stats is not None:
+                stats["read"][source_rank] += 1
+            if code == last_code:
+                if source_rank != winner_rank:
+                    if conflicts is not None:
+                        conflicts.append((code, paths[winner_rank], paths[source_rank]))
+                    if stats is not None:
+                        stats["conflicts"] += 1
+                elif stats is not None:
+                    stats["duplicates"] += 1
+                continue
+            last_code = code
+            winner_rank = source_rank
+            if stats is not None:
+                stats["kept"][source_rank] += 1
+            yield entry
+    finally:
+        for source in sources:
+            source.close()
+
+
+def write_sorted_run(run, tmp_dir, run_index):
+    run.sort(key=lambda item: item[0])
+    run_path = os.path.join(tmp_dir, f"run_{run_index:05d}.pkl")
+    with open(run_path, 'wb') as f:
+        for item in run:
+            pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return run_path
+
+
+def read_sorted_run(run_path):
+    with open(run_path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def gardiner_sorted(records, run_size=200000, tmp_dir=None):
+    """
+    Sort records by Gardiner code with bounded memory (external merge sort).
+    Records are cut into runs of run_size, each run is sorted and spilled to
+    a temporary file, and the runs are merged lazily with heapq.merge. Input
+    smaller than one run is sorted in memory without touching the disk.
+    The sort is stable, so equal codes keep their input order.
+    :param records: Any iterable of sign records (list, generator, stream, SignTable)
+    :param run_size: Records held in memory per run
+    :param tmp_dir: Where to spill runs (default: the system temp folder)
+    :return: Generator of records in Gardiner order
+    """
+    if hasattr(records, "gardiner_order"):
+        # A SignTable keeps its Gardiner order cached next to the columns.
+        for index in records.gardiner_order():
+            yield records[int(index)]
+        return
+    records = iter(records)
+    first_run = list(islice(records, run_size))
+    if len(first_run) < run_size:
+        # Fits in one run: a single argsort over packed keys, no per-record tuples.
+        for index in gardiner_order([entry["code"] for entry in first_run]):
+            yield first_run[index]
+        return
+    keyed = (((gardiner_sort_key(entry["code"]), seq), entry) for seq, entry in enumerate(chain(first_run, records)))
+    first_run = list(islice(keyed, run_size))
+    with tempfile.TemporaryDirectory(prefix="medut_sort_", dir=tmp_dir) as spill_dir:
+        run_paths = [write_sorted_run(first_run, spill_dir, 0)]
+        del first_run
+        while True:
+            run = list(islice(keyed, run_size))
+            if not run:
+                break
+            run_paths.append(write_sorted_run(run, spill_dir, len(run_paths)))
+        del run
+        logging.info(f"Sesh medu: External sort spilled {len(run_paths)} runs to {spill_dir}")
+        for order, entry in heapq.merge(*(read_sorted_run(p) for p in run_paths), key=lambda item: item[0]):
+            yield entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge several sign catalogs in Gardiner order, earlier sources winning.")
+    parser.add_argument('sources', nargs='+', help="Sources in priority order: folders, zip/tar archives or Signs_Master.json files")
+    parser.add_argument('--output', type=str, required=True, help="Merged Signs_Master.json to write")
+    args = parser.parse_args()
+
+    conflicts = []
+    stats = {}
+    count = seal_medut_json_stream(args.output, merge_sources(args.sources, conflicts, stats))
+    print(f"Merged {count} signs from {len(args.sources)} sources into {args.output} "
+          f"({stats['conflicts']} conflicts, {stats['duplicates']} duplicates inside a source)")
+    for path, read, kept in zip(args.sources, stats["read"], stats["kept"]):
+        print(f"  {path}: {kept} of {read} signs kept")
+    for code, winner, loser in conflicts:
+        print(f"  {code}: kept {winner}, dropped {loser}")
+
+
+if __name__ == "__main__":
+    main()
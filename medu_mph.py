@@ -0,0 +1,247 @@
+import os
+import mmap
+import struct
+import hashlib
+import logging
+from collections.abc import Mapping
+from medu_stamp import source_stat, source_fresh
+
+# Signs_Master.mph: a static minimal perfect hash (hash and displace) from
+# sign code to glyph code points and the record's place in Signs_Master.ndjson.
+#   header        HEADER struct
+#   displacements bucket_count x u32
+#   slots         sign_count x SLOT (code in pool, glyph code points, record offset/length)
+#   codepoints    u32 code points, glyph after glyph
+#   pool          UTF-8 codes
+# A lookup hashes the code once, reads one displacement and one slot, and
+# compares the stored code so unknown codes are rejected.
+MPH_MAGIC = b"MEDH"
+MPH_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQQQQQQ")
+SLOT = struct.Struct("<IHHIqI")
+DISPLACEMENT = struct.Struct("<I")
+BUCKET_SIZE = 4
+MAX_D0 = 1024
+
+
+def mph_path(json_path):
+    return os.path.splitext(json_path)[0] + ".mph"
+
+
+def code_hashes(code_bytes, seed):
+    """Three 64-bit hashes of a code: bucket, slot base and slot step."""
+    digest = hashlib.blake2b(code_bytes, digest_size=24, salt=seed.to_bytes(16, 'little')).digest()
+    return (int.from_bytes(digest[0:8], 'little'),
+            int.from_bytes(digest[8:16], 'little'),
+            int.from_bytes(digest[16:24], 'little') | 1)
+
+
+def mph_slot(hashes, d, slot_count):
+    """
+    Slot for a key under displacement d, read as the CHD pair (d0, d1):
+    (h1 + d0 * h2 + d1) mod n. Stepping d1 alone walks every slot, so a
+    bucket of one key always finds the last free slot.
+    """
+    d0, d1 = divmod(d, slot_count)
+    return (hashes[1] + d0 * hashes[2] + d1) % slot_count
+
+
+def place_bucket(taken, bases):
+    """
+    Slots for a bucket under one d0, or None. Walks the free slots from the
+    first key's base (bytearray.find runs in C), taking d1 as the shift that
+    lands the first key there, and accepts the first d1 under which every
+    other key of the bucket lands on a free slot as well.
+    """
+    slot_count = len(taken)
+    first = bases[0]
+    for start, stop in ((first, slot_count), (0, first)):
+        slot = taken.find(0, start, stop)
+        while slot != -1:
+            d1 = slot - first
+            slots = [(base + d1) % slot_count for base in bases]
+            if not any(taken[other] for other in slots[1:]):
+                return slots
+            slot = taken.find(0, slot + 1, stop)
+    return None
+
+
+def place_buckets(hashes, bucket_count, slot_count):
+    """
+    Find a displacement per bucket so every key lands in its own slot.
+    Largest buckets are placed first, while the table is still empty. For
+    each d0 the search only tries d1 values that put the bucket's first key
+    on a free slot, so late buckets (mostly single keys) are placed at once
+    instead of probing a nearly full table.
+    :return: (displacements, slot_of_key) or None if some bucket cannot be placed
+    """
+    buckets = [[] for _ in range(bucket_count)]
+    for key, (h0, h1, h2) in enumerate(hashes):
+        buckets[h0 % bucket_count].append(key)
+    taken = bytearray(slot_count)
+    displacements = [0] * bucket_count
+    slot_of_key = [0] * len(hashes)
+    max_d0 = min(MAX_D0, (1 << 32) // slot_count)
+    for bucket in sorted(range(bucket_count), key=lambda b: -len(buckets[b])):
+        keys = buckets[bucket]
+        if not keys:
+            break
+        slots = None
+        for d0 in range(max_d0):
+            bases = [(hashes[key][1] + d0 * hashes[key][2]) % slot_count for key in keys]
+            if len(set(bases)) == len(bases):
+                slots = place_bucket(taken, bases)
+                if slots is not None:
+                    break
+        if slots is None:
+            return None
+        displacements[bucket] = d0 * slot_count + (slots[0] - bases[0]) % slot_count
+        for key, slot in zip(keys, slots):
+            taken[slot] = 1
+            slot_of_key[key] = slot
+    return displacements, slot_of_key
+
+
+def seal_medut_mph(path, signs, record_offsets=None, source_path=None):
+    """
+    Build the perfect-hash lookup file.
+    :param signs: Sign records or rows; the first record for a code wins
+    :param record_offsets: Optional code -> (offset, length) of the record in
+                           the NDJSON master (the 'codes' map of its index)
+    :param source_path: JSON whose size and mtime mark the file as fresh
+    :return: Number of codes written
+    """
+    record_offsets = record_offsets or {}
+    codes = []
+    glyphs = {}
+    for entry in signs:
+        code = entry["code"]
+        if code not in glyphs:
+            glyphs[code] = entry["glyph"]
+            codes.append(code)
+    encoded = [code.encode('utf-8') for code in codes]
+    count = len(codes)
+    bucket_count = max(1, count // BUCKET_SIZE)
+    for seed in range(64):
+        hashes = [code_hashes(code_bytes, seed) for code_bytes in encoded]
+        placed = place_buckets(hashes, bucket_count, max(1, count))
+        if placed is not None:
+            break
+    else:
+        raise ValueError("Could not build a perfect hash for these codes")
+    displacements, slot_of_key = placed
+
+    slots = [SLOT.pack(0, 0, 0, 0, -1, 0)] * max(1, count)
+    pool = bytearray()
+    codepoints = []
+    for key, code in enumerate(codes):
+        glyph = glyphs[code]
+        offset, length = record_offsets.get(code, (-1, 0))
+        slots[slot_of_key[key]] = SLOT.pack(len(pool), len(encoded[key]), len(glyph), len(codepoints), offset, length)
+        pool += encoded[key]
+        codepoints.extend(ord(ch) for ch in glyph)
+
+    source_size, source_mtime = source_stat(source_path)
+    displacement_offset = HEADER.size
+    slot_offset = displacement_offset + DISPLACEMENT.size * bucket_count
+    codepoint_offset = slot_offset + SLOT.size * len(slots)
+    pool_offset = codepoint_offset + 4 * len(codepoints)
+    header = HEADER.pack(MPH_MAGIC, MPH_VERSION, 0, count, bucket_count, seed, source_size, source_mtime,
+                         displacement_offset, slot_offset, codepoint_offset, pool_offset)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(struct.pack(f"<{bucket_count}I", *displacements))
+        f.write(b"".join(slots))
+        f.write(struct.pack(f"<{len(codepoints)}I", *codepoints))
+        f.write(pool)
+    os.replace(tmp_path, path)
+    logging.info(f"Sesh medu: Perfect-hash lookup sealed ({path}, {count} codes)")
+    return count
+
+
+def mph_fresh(path, json_path):
+    """True when the lookup file is valid and was built from json_path as it is now."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(HEADER.size)
+    except OSError:
+        return False
+    if len(raw) < HEADER.size:
+        return False
+    magic, version, flags, count, bucket_count, seed, source_size, source_mtime = HEADER.unpack(raw)[:8]
+    if magic != MPH_MAGIC or version != MPH_VERSION:
+        return False
+    return source_fresh(source_size, source_mtime, json_path)
+
+
+class PerfectHashLookup(Mapping):
+    """
+    code -> glyph over an mmapped Signs_Master.mph. Opening reads only the
+    header; each lookup is one hash, one displacement and one slot read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, flags, self.count, self.bucket_count, self.seed, source_size, source_mtime,
+         self.displacement_offset, self.slot_offset, self.codepoint_offset, self.pool_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != MPH_MAGIC or version != MPH_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {MPH_VERSION} perfect-hash lookup file: {path}")
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def slot(self, code):
+        """The SLOT fields for code, or None for an unknown code."""
+        if not self.count:
+            return None
+        code_bytes = code.encode('utf-8')
+        hashes = code_hashes(code_bytes, self.seed)
+        d = DISPLACEMENT.unpack_from(self.mm, self.displacement_offset + DISPLACEMENT.size * (hashes[0] % self.bucket_count))[0]
+        fields = SLOT.unpack_from(self.mm, self.slot_offset + SLOT.size * mph_slot(hashes, d, self.count))
+        start = self.pool_offset + fields[0]
+        if self.mm[start:start + fields[1]] != code_bytes:
+            return None
+        return fields
+
+    def codepoints(self, code):
+        fields = self.slot(code)
+        if fields is None:
+            return None
+        start = self.codepoint_offset + 4 * fields[3]
+        return list(struct.unpack_from(f"<{fields[2]}I", self.mm, start))
+
+    def record_offset(self, code):
+        """(offset, length) of the record in Signs_Master.ndjson, or None."""
+        fields = self.slot(code)
+        if fields is None or fields[4] < 0:
+            return None
+        return fields[4], fields[5]
+
+    def __getitem__(self, code):
+        codepoints = self.codepoints(code)
+        if codepoints is None:
+            raise KeyError(code)
+        return "".join(map(chr, codepoints))
+
+    def __contains__(self, code):
+        return self.slot(code) is not None
+
+    def __iter__(self):
+        for slot in range(self.count):
+            code_offset, code_length = SLOT.unpack_from(self.mm, self.slot_offset + SLOT.size * slot)[:2]
+            start = self.pool_offset + code_offset
+            yield self.mm[start:start + code_length].decode('utf-8')
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,203 @@
+import os
+import json
+import logging
+import argparse
+from medu_stamp import source_stat, source_fresh
+
+NDJSON_INDEX_VERSION = 1
+
+
+def ndjson_master_path(json_path):
+    return os.path.splitext(json_path)[0] + ".ndjson"
+
+
+def ndjson_index_path(ndjson_path):
+    return ndjson_path + ".idx.json"
+
+
+def index_ndjson_line(codes, categories, entry, offset, length):
+    """Record one line: code -> [offset, length]; category -> runs of [start, end, count]."""
+    codes.setdefault(entry["code"], [offset, length])
+    ranges = categories.setdefault(entry["category"], [])
+    if ranges and ranges[-1][1] == offset:
+        ranges[-1][1] = offset + length
+        ranges[-1][2] += 1
+    else:
+        ranges.append([offset, offset + length, 1])
+
+
+def seal_medut_ndjson(path, records, source_path=None):
+    """
+    Write one sign per line (compact JSON, UTF-8) plus a sidecar offset index.
+    The index maps every code to (offset, length) of its line and every
+    category to the byte ranges its signs occupy, so readers can seek
+    straight to a record or a category.
+    :param source_path: The master JSON the file mirrors; its size and mtime
+                        are stored in the index (see ndjson_master_fresh)
+    :return: Number of signs written
+    """
+    codes = {}
+    categories = {}
+    offset = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        for entry in records:
+            if not isinstance(entry, dict):
+                entry = dict(entry)
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+            f.write(line)
+            index_ndjson_line(codes, categories, entry, offset, len(line))
+            offset += len(line)
+    os.replace(tmp_path, path)
+    index = {
+        "version": NDJSON_INDEX_VERSION,
+        "size": offset,
+        "signs": sum(count for ranges in categories.values() for start, end, count in ranges),
+        "codes": codes,
+        "categories": categories
+    }
+    seal_ndjson_index(path, index, source_path)
+    logging.info(f"Sesh medu: Papyrus sealed in NDJSON ({path}, {index['signs']} signs)")
+    return index["signs"]
+
+
+def seal_ndjson_index(path, index, source_path=None):
+    """
+    Stamp an offset index with the master JSON it mirrors and write it
+    atomically next to the NDJSON file.
+    :param source_path: The master JSON; its size and mtime are stored in the index
+    """
+    index["source_size"], index["source_mtime_ns"] = source_stat(source_path)
+    index_path = ndjson_index_path(path)
+    with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(index_path + ".tmp", index_path)
+
+
+def iter_medut_ndjson(path):
+    """Stream sign records from an NDJSON master with constant memory."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def index_medut_ndjson(path):
+    """Rebuild the offset index of an NDJSON master by scanning it once."""
+    codes = {}
+    categories = {}
+    offset = 0
+    signs = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                index_ndjson_line(codes, categories, entry, offset, len(line))
+                signs += 1
+            offset += len(line)
+    return {"version": NDJSON_INDEX_VERSION, "size": offset, "signs": signs, "codes": codes, "categories": categories}
+
+
+def ndjson_master_fresh(path, json_path):
+    """True when the NDJSON master and its index were sealed from json_path as it is now."""
+    try:
+        with open(ndjson_index_path(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        size = os.path.getsize(path)
+    except (OSError, ValueError):
+        return False
+    if index.get("version") != NDJSON_INDEX_VERSION or index.get("size") != size:
+        return False
+    return source_fresh(index.get("source_size"), index.get("source_mtime_ns"), json_path)
+
+
+def load_ndjson_index(path):
+    """Load the sidecar index, rebuilding it in memory if it is missing or does not match the file."""
+    index_path = ndjson_index_path(path)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") == NDJSON_INDEX_VERSION and index.get("size") == os.path.getsize(path):
+            return index
+        logging.info(f"Sesh medu: NDJSON index '{index_path}' is stale, rescanning {path}")
+    except (OSError, ValueError) as e:
+        logging.info(f"Sesh medu: No usable NDJSON index for {path} - {e}")
+    return index_medut_ndjson(path)
+
+
+class NdjsonMaster:
+    """Random access into an NDJSON master through its offset index."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = load_ndjson_index(path)
+        self.file = open(path, 'rb')
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.index["signs"]
+
+    def __contains__(self, code):
+        return code in self.index["codes"]
+
+    def __iter__(self):
+        return iter_medut_ndjson(self.path)
+
+    def categories(self):
+        """Category names in first-seen order."""
+        return list(self.index["categories"])
+
+    def find(self, code):
+        """The record for a code (one seek and one line read), or None."""
+        location = self.index["codes"].get(code)
+        if location is None:
+            return None
+        offset, length = location
+        self.file.seek(offset)
+        return json.loads(self.file.read(length))
+
+    def category(self, category):
+        """Stream the records of one category, reading only its byte ranges."""
+        for start, end, count in self.index["categories"].get(category, []):
+            position = start
+            while position < end:
+                # Seek every line so interleaved find() calls cannot move us.
+                self.file.seek(position)
+                line = self.file.readline()
+                position += len(line)
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up signs in an NDJSON sign master.")
+    parser.add_argument('ndjson', type=str, help="Signs_Master.ndjson")
+    parser.add_argument('--code', type=str, action='append', default=[], help="Sign code to print (repeatable)")
+    parser.add_argument('--category', type=str, help="Print every sign of this category")
+    parser.add_argument('--reindex', action='store_true', help="Rewrite the sidecar index from the file")
+    parser.add_argument('--json', type=str, help="Master JSON the file mirrors, stamped into a rewritten index (default: Signs_Master.json beside it)")
+    args = parser.parse_args()
+
+    if args.reindex:
+        index = index_medut_ndjson(args.ndjson)
+        seal_ndjson_index(args.ndjson, index, args.json or os.path.splitext(args.ndjson)[0] + ".json")
+        print(f"Indexed {index['signs']} signs in {args.ndjson}")
+    with NdjsonMaster(args.ndjson) as master:
+        for code in args.code:
+            entry = master.find(code)
+            print(json.dumps(entry, ensure_ascii=False) if entry else f"{code}: not found")
+        if args.category:
+            for entry in master.category(args.category):
+                print(json.dumps(entry, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
 import svgwrite
 import argparse
 import os
-import json
+from medu_mph import PerfectHashLookup, mph_fresh, mph_path
 
-def load_sign_map(json_path):
-    """Load mapping of sign codes to glyphs from JSON."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        signs = json.load(f)
-    return {entry['code']: entry['glyph'] for entry in signs}
+def load_sign_map(json_path, category_dir=None):
+    """
+    Mapping of sign codes to glyphs. Served from the perfect-hash file
+    (Signs_Master.mph) when fresh, else from the per-category JSON files
+    (only the categories the codes need), else the binary catalog or JSON.
+    """
+    if not category_dir and mph_fresh(mph_path(json_path), json_path):
+        return PerfectHashLookup(mph_path(json_path))
+    # The fallbacks are only imported when the perfect-hash file cannot serve the lookup.
+    from medu_catalog import load_catalog, CatalogGlyphs
+    from medu_lazy import LazyCatalog, category_index_fresh
+    if category_dir:
+        return CatalogGlyphs(LazyCatalog(category_dir))
+    category_dir = os.path.join(os.path.dirname(json_path), "signs_by_category_json")
+    if category_index_fresh(category_dir, json_path):
+        return CatalogGlyphs(LazyCatalog(category_dir))
+    return CatalogGlyphs(load_catalog(json_path))
 
 def medu_netcher_render(signs, sign_map, title=None, font_size=48, font_family="Aegyptus", as_svg=False, vertical=False):
     """Render Medu NeTcher signs as Unicode or SVG."""
@@ -57,6 +69,7 @@ def medu_netcher_render(signs, sign_map, title=None, font_size=48, font_family="
 def main():
     parser = argparse.ArgumentParser(description="Render Medu Neṭer signs as Unicode or SVG.")
     parser.add_argument('--json', type=str, required=True, help="Path to Signs_Master.json")
+    parser.add_argument('--category_dir', type=str, help="Read signs from this signs_by_category_json folder, loading only the categories needed")
     parser.add_argument('--codes', type=str, required=True, help="Comma-separated list of sign codes (e.g., A1,G17,HIER001)")
     parser.add_argument('--svg', action='store_true', help="Output SVG instead of Unicode text")
     parser.add_argument('--vertical', action='store_true', help="Stack signs vertically")
@@ -67,7 +80,7 @@ def main():
     args = parser.parse_args()
 
     # Load sign mapping
-    sign_map = load_sign_map(args.json)
+    sign_map = load_sign_map(args.json, args.category_dir)
     # Parse codes
     signs = [code.strip() for code in args.codes.split(',')]
     # Render
@@ -0,0 +1,269 @@
+import os
+import re
+import mmap
+
+
+def is_category_header(line):
+    """A category header has a dash and no digits (e.g. 'A - Man')."""
+    return "-" in line and not any(ch.isdigit() for ch in line)
+
+
+def default_category(filename):
+    """Category used when a papyrus has no header line of its own."""
+    return os.path.basename(filename).replace(".txt", "")
+
+
+def medut_entry(category, code, glyph_line):
+    """Build one sign record from a code line and the glyph line after it."""
+    description = ""
+    glyph_parts = glyph_line.split(maxsplit=1)
+    glyph = glyph_parts[0]
+    if len(glyph_parts) > 1:
+        description = glyph_parts[1]
+    return medut_record(category, code, glyph, description)
+
+
+def glyph_unicode_escape(glyph):
+    return glyph.encode('unicode_escape').decode('utf-8')
+
+
+def glyph_unicode_hex(glyph):
+    return " ".join([f"U+{ord(ch):04X}" for ch in glyph])
+
+
+def medut_record(category, code, glyph, description):
+    return {
+        "category": category,
+        "code": code,
+        "glyph": glyph,
+        "unicode_escape": glyph_unicode_escape(glyph),
+        "unicode_hex": glyph_unicode_hex(glyph),
+        "description": description
+    }
+
+
+def iter_medut_stream(stream):
+    """Yield the stripped lines of an open text stream; blank lines come through as '' so callers can number lines."""
+    for raw in stream:
+        yield raw.strip()
+
+
+def iter_medut_lines(file_path):
+    """Yield the stripped lines of a papyrus one at a time (blank lines as '')."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_medut_stream(f)
+
+
+def parse_medut_lines(lines, category, source="", diagnostics=None):
+    """
+    Pair code lines with the glyph line that follows them.
+    A line taken as a code must look like one and the line after it must
+    start with a glyph; otherwise the problem is reported and pairing
+    restarts on that line, so a stray 'G Birds' costs one sign instead of
+    shifting every later code onto the wrong glyph.
+    :param lines: Iterable of stripped lines (blank lines included, for line numbers)
+    :param category: Category used until the first header line is seen
+    :param source: Name reported in diagnostics
+    :param diagnostics: Optional list receiving (source, line_no, problem, text)
+    :return: Generator of sign records, in file order
+    """
+    current_category = None
+    code = None
+    code_line_no = 0
+    for line_no, line in enumerate(lines, start=1):
+        if not line:
+            continue
+        if code is not None:
+            if line[0] > "\x7f":
+                yield medut_entry(current_category or category, code, line)
+                code = None
+                continue
+            if diagnostics is not None:
+                diagnostics.append((source, code_line_no, "code without glyph", code))
+            code = None
+        if is_category_header(line):
+            current_category = line
+        elif CODE_LINE.fullmatch(line) is not None:
+            code = line
+            code_line_no = line_no
+        elif diagnostics is not None:
+            diagnostics.append((source, line_no, "glyph without code" if line[0] > "\x7f" else "unrecognised line", line))
+    if code is not None and diagnostics is not None:
+        diagnostics.append((source, code_line_no, "code without glyph", code))
+
+
+# str.strip() also drops these ASCII control separators; bytes.strip() does not.
+ASCII_STRIP = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+ASCII_DIGITS = frozenset(b"0123456789")
+
+
+def iter_medut_lines_mmap(file_path):
+    """
+    Yield the stripped lines of a papyrus (blank lines as empty), splitting on
+    b"\\n" inside a read-only mmap so the file is never decoded or held as a whole.
+    ASCII lines are stripped and yielded as bytes; only lines with non-ASCII
+    bytes are decoded (and yielded as str). For \\n or \\r\\n files the lines
+    match iter_medut_lines.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            end = len(mm)
+            pos = 0
+            while pos < end:
+                newline = mm.find(b"\n", pos)
+                if newline == -1:
+                    newline = end
+                raw = mm[pos:newline]
+                pos = newline + 1
+                if raw.isascii():
+                    yield raw.strip(ASCII_STRIP)
+                else:
+                    yield raw.decode('utf-8').strip()
+
+
+def parse_medut_mmap_lines(lines, category, source="", diagnostics=None):
+    """
+    Same pairing and resynchronisation as parse_medut_lines over
+    iter_medut_lines_mmap output. ASCII lines stay as bytes until they are
+    kept, so header and code checks on plain-ASCII lines never decode
+    anything; a glyph line is never pure ASCII, so it always arrives as str.
+    """
+    current_category = None
+    code = None
+    code_line_no = 0
+    for line_no, line in enumerate(lines, start=1):
+        if not line:
+            continue
+        if code is not None:
+            if isinstance(line, str) and line[0] > "\x7f":
+                yield medut_entry(current_category or category, code, line)
+                code = None
+                continue
+            if diagnostics is not None:
+                diagnostics.append((source, code_line_no, "code without glyph", code))
+            code = None
+        if isinstance(line, bytes):
+            if b"-" in line and ASCII_DIGITS.isdisjoint(line):
+                current_category = line.decode('ascii')
+            elif CODE_BYTES.fullmatch(line) is not None:
+                code = line.decode('ascii')
+                code_line_no = line_no
+            elif diagnostics is not None:
+                diagnostics.append((source, line_no, "unrecognised line", line.decode('ascii')))
+        elif is_category_header(line):
+            current_category = line
+        elif CODE_LINE.fullmatch(line) is not None:
+            code = line
+            code_line_no = line_no
+        elif diagnostics is not None:
+            diagnostics.append((source, line_no, "glyph without code" if line[0] > "\x7f" else "unrecognised line", line))
+    if code is not None and diagnostics is not None:
+        diagnostics.append((source, code_line_no, "code without glyph", code))
+
+
+# Compiled line grammar. Glyph lines are recognised by their first character
+# (outside ASCII) without touching a regex; everything else is either a code
+# ('A1', 'Aa15', 'K4B', 'HIER001', 'R1,'), a header ('A - Man', 'K Fishes') or junk.
+CODE_LINE = re.compile(r"([A-Za-z]+\d+[A-Za-z]*),?")
+CODE_BYTES = re.compile(rb"[A-Za-z]+\d+[A-Za-z]*,?")
+HEADER_LINE = re.compile(r"(?=[^\d]*-)[^\d]+|[A-Z][a-z]?\s+[A-Za-z][^\d]*")
+
+BLANK, HEADER, CODE, GLYPH, JUNK = "blank", "header", "code", "glyph", "junk"
+
+
+def classify_line(line):
+    """
+    Label one stripped line.
+    :return: (kind, value) where kind is blank, header, code, glyph or junk;
+             value is the code, (glyph, description) or the header text
+    """
+    if not line:
+        return BLANK, None
+    if line[0] > "\x7f":
+        glyph_parts = line.split(maxsplit=1)
+        return GLYPH, (glyph_parts[0].rstrip(","), glyph_parts[1] if len(glyph_parts) > 1 else "")
+    match = CODE_LINE.fullmatch(line)
+    if match is not None:
+        return CODE, match.group(1)
+    if HEADER_LINE.fullmatch(line) is not None:
+        return HEADER, line
+    return JUNK, None
+
+
+def parse_medut_grammar(lines, category, source="", diagnostics=None):
+    """
+    Pair codes with glyph lines using classify_line, resynchronising on errors.
+    A code with no glyph line is dropped instead of swallowing the next code,
+    and a stray glyph or junk line is skipped, so one typo costs one sign
+    rather than shifting every sign after it.
+    :param lines: Iterable of raw lines (blank lines included, for line numbers)
+    :param category: Category used until the first header line is seen
+    :param source: Name reported in diagnostics
+    :param diagnostics: Optional list receiving (source, line_no, problem, text)
+    :return: Generator of sign records, in file order
+    """
+    def report(line_no, problem, text):
+        if diagnostics is not None:
+            diagnostics.append((source, line_no, problem, text))
+
+    current_category = None
+    code = None
+    code_line_no = 0
+    for line_no, raw in enumerate(lines, start=1):
+        line = raw.strip()
+        kind, value = classify_line(line)
+        if kind == BLANK:
+            continue
+        if kind == CODE:
+            if code is not None:
+                report(code_line_no, "code without glyph", code)
+            code = value
+            code_line_no = line_no
+        elif kind == GLYPH:
+            if code is None:
+                report(line_no, "glyph without code", line)
+                continue
+            yield medut_record(current_category or category, code, value[0], value[1])
+            code = None
+        elif kind == HEADER:
+            if code is not None:
+                report(code_line_no, "code without glyph", code)
+                code = None
+            current_category = line
+        else:
+            report(line_no, "unrecognised line", line)
+    if code is not None:
+        report(code_line_no, "code without glyph", code)
+
+
+def seal_medut_diagnostics(path, diagnostics):
+    """Write diagnostics as 'file:line: problem: text', one per line."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for source, line_no, problem, text in diagnostics:
+            f.write(f"{source}:{line_no}: {problem}: {text}\n")
+
+
+def parse_medut_file(file_path, mode="stream", diagnostics=None):
+    """
+    Stream the sign records of one category .txt file.
+    :param mode: 'stream' reads decoded text lines; 'mmap' splits the file at
+                 the byte level for very large sign lists; 'grammar' classifies
+                 every line and resynchronises after broken code/glyph pairs
+    :param diagnostics: List receiving (source, line_no, problem, text) for
+                        lines that could not be paired, in every mode
+    """
+    source = os.path.basename(file_path)
+    if mode == "grammar":
+        return parse_medut_grammar_file(file_path, diagnostics)
+    if mode == "mmap":
+        return parse_medut_mmap_lines(iter_medut_lines_mmap(file_path), default_category(file_path), source, diagnostics)
+    return parse_medut_lines(iter_medut_lines(file_path), default_category(file_path), source, diagnostics)
+
+
+def parse_medut_grammar_file(file_path, diagnostics=None):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from parse_medut_grammar(f, default_category(file_path), os.path.basename(file_path), diagnostics)
@@ -0,0 +1,218 @@
+import os
+import json
+import logging
+import argparse
+from bisect import bisect_left
+from medu_lazy import code_prefix
+from medu_stamp import source_stat, source_fresh
+from medu_catalog import load_catalog
+
+PREFIX_INDEX_VERSION = 1
+# Separates a code's family letters from the rest of its key, and sorts
+# before every letter and digit, so one family's codes are one contiguous
+# run (N1..N42, then NL1.., then NU1..) and families nest under their letters.
+FAMILY_END = "\x00"
+
+
+def prefix_index_path(json_path):
+    return os.path.splitext(json_path)[0] + ".prefix.json"
+
+
+def prefix_key(code):
+    """Case-insensitive sort key of a code: 'Aa15' -> 'aa\\x0015', 'N35' -> 'n\\x0035'."""
+    family = code_prefix(code)
+    if family == code:
+        return code.casefold()
+    return family.casefold() + FAMILY_END + code[len(family):].casefold()
+
+
+def query_key(prefix):
+    """
+    Key prefix for a typed prefix. A prefix of letters only ('N') may still
+    grow into a longer family ('NL'), so it gets no family separator; once a
+    digit follows, the family is settled ('N3' -> 'n\\x003').
+    """
+    family = code_prefix(prefix)
+    if family == prefix:
+        return prefix.casefold()
+    return prefix_key(prefix)
+
+
+class PrefixIndex:
+    """
+    Sign codes in one sorted array of prefix keys; every code starting with a
+    prefix is the contiguous run between two bisections, so lookups cost
+    O(log n + k) and never scan the catalog. Within a run codes are in key
+    order: A1, A10, A100, A11, ..., A1A, A1B.
+    """
+
+    def __init__(self, codes, glyphs):
+        """
+        :param codes: Sign codes, already unique and in prefix_key order (see build)
+        :param glyphs: Glyphs parallel to codes, returned with completions
+        """
+        self.keys = [prefix_key(code) for code in codes]
+        self.codes = codes
+        self.glyphs = glyphs
+
+    @classmethod
+    def build(cls, codes, glyphs=None):
+        """Index codes in any order; duplicates keep the first glyph."""
+        glyphs = [""] * len(codes) if glyphs is None else glyphs
+        entries = {}
+        for code, glyph in zip(codes, glyphs):
+            entries.setdefault(code, glyph)
+        ordered = sorted(entries, key=lambda code: (prefix_key(code), code))
+        return cls(ordered, [entries[code] for code in ordered])
+
+    @classmethod
+    def from_catalog(cls, signs):
+        if hasattr(signs, "codes") and hasattr(signs, "glyphs"):
+            return cls.build(list(signs.codes), list(signs.glyphs))
+        codes = []
+        glyphs = []
+        for entry in signs:
+            codes.append(entry["code"])
+            glyphs.append(entry["glyph"])
+        return cls.build(codes, glyphs)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        index = bisect_left(self.keys, prefix_key(code))
+        return index < len(self.keys) and self.keys[index] == prefix_key(code)
+
+    def key_range(self, key):
+        """(start, end) of the run of keys starting with key."""
+        start = bisect_left(self.keys, key)
+        # Every key with this prefix sorts before key + the highest code point.
+        end = bisect_left(self.keys, key + "\U0010FFFF", start)
+        return start, end
+
+    def prefix_range(self, prefix):
+        return self.key_range(query_key(prefix))
+
+    def count(self, prefix):
+        start, end = self.prefix_range(prefix)
+        return end - start
+
+    def starting_with(self, prefix):
+        """Every code starting with prefix (case-insensitive), in key order."""
+        start, end = self.prefix_range(prefix)
+        return self.codes[start:end]
+
+    def complete(self, prefix, limit=10):
+        """
+        Up to limit (code, glyph) completions for a typed prefix. An exact
+        match comes first, since its key is the shortest in the run.
+        """
+        start, end = self.prefix_range(prefix)
+        end = min(end, start + limit)
+        return list(zip(self.codes[start:end], self.glyphs[start:end]))
+
+    def family(self, family):
+        """Codes of exactly one Gardiner family: 'N' gives N1.., not NL1 or NU1."""
+        start, end = self.key_range(family.casefold() + FAMILY_END)
+        return self.codes[start:end]
+
+    def families(self):
+        """(family, sign count) for every family, in key order."""
+        counts = []
+        index = 0
+        while index < len(self.keys):
+            family = code_prefix(self.codes[index])
+            # A bare family code ('A') sorts just before the family's run.
+            start, end = self.key_range(family.casefold() + FAMILY_END)
+            end = max(end, index + 1)
+            counts.append((family, end - index))
+            index = end
+        return counts
+
+    def to_dict(self):
+        return {"version": PREFIX_INDEX_VERSION, "codes": self.codes, "glyphs": self.glyphs}
+
+    @classmethod
+    def from_dict(cls, index):
+        """The sealed file is already in key order, so loading does not sort."""
+        return cls(index["codes"], index["glyphs"])
+
+
+def seal_prefix_index(path, signs, source_path=None):
+    """
+    Write the prefix index (codes and glyphs in key order) as compact JSON.
+    :param source_path: The master JSON the index mirrors; its size and mtime
+                        are stored so load_prefix_index can tell when it is stale
+    """
+    index = PrefixIndex.from_catalog(signs)
+    sealed = index.to_dict()
+    sealed["source_size"], sealed["source_mtime_ns"] = source_stat(source_path)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(sealed, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+    logging.info(f"Sesh medu: Prefix index sealed ({path}, {len(index)} codes)")
+    return index
+
+
+def restamp_prefix_index(path, previous_stat, source_path):
+    """
+    Carry an index whose codes and glyphs did not change over to a rewritten
+    master JSON by updating the stored size and mtime instead of rebuilding it.
+    :param previous_stat: source_stat() of the master before it was rewritten
+    :return: False when the index was not built from that master; rebuild it then
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            sealed = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if sealed.get("version") != PREFIX_INDEX_VERSION or (sealed.get("source_size"), sealed.get("source_mtime_ns")) != tuple(previous_stat):
+        return False
+    sealed["source_size"], sealed["source_mtime_ns"] = source_stat(source_path)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(sealed, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+    return True
+
+
+def load_prefix_index(json_path):
+    """
+    Prefix index for a Signs_Master.json: the sealed .prefix.json when it is
+    current, otherwise built from the catalog.
+    """
+    path = prefix_index_path(json_path)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if (index.get("version") == PREFIX_INDEX_VERSION
+                    and source_fresh(index.get("source_size"), index.get("source_mtime_ns"), json_path)):
+                return PrefixIndex.from_dict(index)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Isfet Kheper: Could not read prefix index '{path}' - {e}")
+    return PrefixIndex.from_catalog(load_catalog(json_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Complete sign codes from a prefix, or list a Gardiner family.")
+    parser.add_argument('json', type=str, help="Signs_Master.json (its .prefix.json is used when current)")
+    parser.add_argument('prefix', nargs='*', help="Code prefixes to complete (e.g. A1, Aa, NL)")
+    parser.add_argument('--limit', type=int, default=10, help="Completions per prefix")
+    parser.add_argument('--family', type=str, action='append', default=[], help="Print every code of this family (repeatable)")
+    parser.add_argument('--families', action='store_true', help="Print every family with its sign count")
+    args = parser.parse_args()
+
+    index = load_prefix_index(args.json)
+    for prefix in args.prefix:
+        total = index.count(prefix)
+        completions = " ".join(f"{code} {glyph}".strip() for code, glyph in index.complete(prefix, args.limit))
+        print(f"{prefix} ({total}): {completions}")
+    for family in args.family:
+        print(f"{family}: {' '.join(index.family(family))}")
+    if args.families:
+        for family, count in index.families():
+            print(f"{family}\t{count}")
+
+
+if __name__ == "__main__":
+    main()
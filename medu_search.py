@@ -0,0 +1,276 @@
+import os
+import re
+import math
+import mmap
+import heapq
+import struct
+import logging
+import argparse
+from array import array
+from collections import Counter
+from medu_stamp import source_stat, source_fresh
+from medu_catalog import load_catalog
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Signs_Master.bm25: inverted index over sign descriptions (little endian).
+#   header    HEADER struct (magic, version, counts, average length, source stat, section offsets)
+#   terms     term_count x (term off, term len, first posting, document frequency), sorted by term
+#   postings  u32 sign rows, term after term, rows ascending within a term
+#   tfs       u16 term frequency per posting
+#   lengths   u16 token count per sign
+#   docs      sign_count x (code off, code len)
+#   pool      UTF-8 terms and codes
+SEARCH_MAGIC = b"MEDS"
+SEARCH_VERSION = 1
+HEADER = struct.Struct("<4sHHIIdQQQQQQQQ")
+TERM = struct.Struct("<IIII")
+DOC = struct.Struct("<II")
+TOKEN = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def description_index_path(json_path):
+    return os.path.splitext(json_path)[0] + ".bm25"
+
+
+def tokenize(text):
+    """Lowercased word tokens of a description or query."""
+    return TOKEN.findall(text.casefold())
+
+
+def pack_description_index(signs, source_size=0, source_mtime=0):
+    """
+    Tokenize every sign's description and lay the postings out for
+    DescriptionIndex. Rows are catalog positions, so a sign without a
+    description still takes a row (with length 0).
+    :return: (index bytes, number of signs, number of terms)
+    """
+    postings = {}
+    lengths = array('H')
+    codes = []
+    for row, entry in enumerate(signs):
+        tokens = tokenize(entry.get("description", "") or "")
+        lengths.append(min(len(tokens), 0xFFFF))
+        codes.append(entry["code"])
+        for term, tf in Counter(tokens).items():
+            postings.setdefault(term, []).append((row, min(tf, 0xFFFF)))
+
+    pool = bytearray()
+    terms = bytearray()
+    rows = array('I')
+    tfs = array('H')
+    for term in sorted(postings):
+        data = term.encode('utf-8')
+        terms += TERM.pack(len(pool), len(data), len(rows), len(postings[term]))
+        pool += data
+        for row, tf in postings[term]:
+            rows.append(row)
+            tfs.append(tf)
+    docs = bytearray()
+    for code in codes:
+        data = code.encode('utf-8')
+        docs += DOC.pack(len(pool), len(data))
+        pool += data
+    if len(pool) > 0xFFFFFFFF:
+        raise ValueError("String pool exceeds 4 GB")
+    if array('I').itemsize != 4 or array('H').itemsize != 2:
+        raise RuntimeError("Unexpected array item sizes on this platform")
+
+    average_length = sum(lengths) / len(lengths) if lengths else 0.0
+    sections = [terms, rows.tobytes(), tfs.tobytes(), lengths.tobytes(), docs, pool]
+    offsets = []
+    offset = HEADER.size
+    for section in sections:
+        offsets.append(offset)
+        offset += len(section)
+    header = HEADER.pack(SEARCH_MAGIC, SEARCH_VERSION, 0, len(codes), len(postings), average_length,
+                         source_size, source_mtime, *offsets)
+    return b"".join([header] + [bytes(section) for section in sections]), len(codes), len(postings)
+
+
+def seal_description_index(path, signs, source_path=None):
+    """
+    Write the description index next to Signs_Master.json.
+    :param signs: Sign records or SignTable rows, in catalog order
+    :param source_path: The JSON the index mirrors; its size and mtime are
+                        stored so readers can tell when the index is stale
+    :return: Number of distinct terms
+    """
+    data, count, term_count = pack_description_index(signs, *source_stat(source_path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    logging.info(f"Sesh medu: Description index sealed ({path}, {count} signs, {term_count} terms)")
+    return term_count
+
+
+def description_index_fresh(path, json_path):
+    """True when the index is valid and was built from json_path as it is now."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(HEADER.size)
+    except OSError:
+        return False
+    if len(raw) < HEADER.size:
+        return False
+    magic, version, flags, count, term_count, average_length, source_size, source_mtime = HEADER.unpack(raw)[:8]
+    if magic != SEARCH_MAGIC or version != SEARCH_VERSION:
+        return False
+    return source_fresh(source_size, source_mtime, json_path)
+
+
+def restamp_description_index(path, previous_stat, source_path):
+    """
+    Carry an index whose inputs did not change over to a rewritten master
+    JSON by updating the stored size and mtime instead of rebuilding it.
+    :param previous_stat: source_stat() of the master before it was rewritten
+    :return: False when the index was not built from that master; rebuild it then
+    """
+    try:
+        with open(path, 'r+b') as f:
+            raw = f.read(HEADER.size)
+            if len(raw) < HEADER.size:
+                return False
+            fields = list(HEADER.unpack(raw))
+            if fields[0] != SEARCH_MAGIC or fields[1] != SEARCH_VERSION or tuple(fields[6:8]) != tuple(previous_stat):
+                return False
+            fields[6:8] = source_stat(source_path)
+            f.seek(0)
+            f.write(HEADER.pack(*fields))
+    except OSError:
+        return False
+    return True
+
+
+class DescriptionIndex:
+    """
+    Ranked description search over an mmapped Signs_Master.bm25. Opening
+    reads the term table and the sign lengths; a query reads only the
+    postings of its own terms and scores them with BM25 (with NumPy when
+    installed, which keeps common terms fast on large catalogs).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, flags, self.count, self.term_count, self.average_length, source_size, source_mtime,
+         term_offset, self.posting_offset, self.tf_offset, length_offset, self.doc_offset,
+         self.pool_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != SEARCH_MAGIC or version != SEARCH_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {SEARCH_VERSION} description index: {path}")
+        self.terms = {}
+        for term_off, term_len, first, frequency in TERM.iter_unpack(self.mm[term_offset:term_offset + TERM.size * self.term_count]):
+            start = self.pool_offset + term_off
+            self.terms[str(self.mm[start:start + term_len], 'utf-8')] = (first, frequency)
+        lengths = self.mm[length_offset:length_offset + 2 * self.count]
+        self.lengths = np.frombuffer(lengths, dtype='<u2').astype(np.float64) if np is not None else array('H', lengths)
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def code(self, row):
+        code_off, code_len = DOC.unpack_from(self.mm, self.doc_offset + DOC.size * row)
+        start = self.pool_offset + code_off
+        return str(self.mm[start:start + code_len], 'utf-8')
+
+    def idf(self, frequency):
+        return math.log(1 + (self.count - frequency + 0.5) / (frequency + 0.5))
+
+    def postings(self, term):
+        """(rows, term frequencies) of one term as raw bytes, or None for an unknown term."""
+        found = self.terms.get(term)
+        if found is None:
+            return None
+        first, frequency = found
+        rows = self.mm[self.posting_offset + 4 * first:self.posting_offset + 4 * (first + frequency)]
+        tfs = self.mm[self.tf_offset + 2 * first:self.tf_offset + 2 * (first + frequency)]
+        return rows, tfs, frequency
+
+    def search_rows(self, query, limit=10):
+        """
+        BM25 search; any query term may match, signs matching more (and
+        rarer) terms rank higher. Ties keep catalog order.
+        :return: List of (row, score), best first
+        """
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self.terms]
+        if not terms or limit <= 0:
+            return []
+        average_length = self.average_length or 1.0
+        if np is not None:
+            return self.score_numpy(terms, limit, average_length)
+        scores = {}
+        for term in terms:
+            rows, tfs, frequency = self.postings(term)
+            idf = self.idf(frequency)
+            for row, tf in zip(array('I', rows), array('H', tfs)):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[row] / average_length)
+                scores[row] = scores.get(row, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return heapq.nsmallest(limit, ((row, score) for row, score in scores.items()), key=lambda item: (-item[1], item[0]))
+
+    def score_numpy(self, terms, limit, average_length):
+        row_parts = []
+        score_parts = []
+        for term in terms:
+            rows, tfs, frequency = self.postings(term)
+            rows = np.frombuffer(rows, dtype='<u4')
+            tfs = np.frombuffer(tfs, dtype='<u2').astype(np.float64)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[rows] / average_length)
+            row_parts.append(rows)
+            score_parts.append(self.idf(frequency) * tfs * (BM25_K1 + 1) / (tfs + norm))
+        rows = np.concatenate(row_parts)
+        scores = np.concatenate(score_parts)
+        if len(row_parts) > 1:
+            rows, inverse = np.unique(rows, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+        if len(rows) > limit:
+            keep = np.argpartition(-scores, limit - 1)[:limit]
+            # Rows tied with the cut-off score may have been dropped in favour of later ones.
+            cutoff = scores[keep].min()
+            keep = np.union1d(keep, np.flatnonzero(scores == cutoff))
+            rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((rows, -scores))[:limit]
+        return [(int(rows[i]), float(scores[i])) for i in order]
+
+    def search(self, query, limit=10):
+        """:return: List of (code, score), best first"""
+        return [(self.code(row), score) for row, score in self.search_rows(query, limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search sign descriptions, best matches first.")
+    parser.add_argument('json', type=str, help="Signs_Master.json (its .bm25 index is built when missing or stale)")
+    parser.add_argument('query', nargs='+', help="Words to search for (e.g. seated man holding)")
+    parser.add_argument('--limit', type=int, default=10, help="Number of results")
+    parser.add_argument('--reindex', action='store_true', help="Rebuild the index from the catalog first")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.json)
+    index_path = description_index_path(args.json)
+    if args.reindex or not description_index_fresh(index_path, args.json):
+        seal_description_index(index_path, catalog, args.json)
+    with DescriptionIndex(index_path) as index:
+        for code, score in index.search(" ".join(args.query), args.limit):
+            entry = catalog.find(code)
+            print(f"{score:7.3f}\t{code}\t{entry['glyph'] if entry else ''}\t{entry['description'] if entry else ''}")
+
+
+if __name__ == "__main__":
+    main()
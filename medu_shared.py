@@ -0,0 +1,74 @@
+import logging
+from multiprocessing import shared_memory, resource_tracker
+from medu_catalog import BinaryCatalog, pack_medut_binary
+
+# A worker process attaches once (pool initializer) and keeps the view here.
+worker_catalog = None
+
+
+def publish_shared_catalog(signs, name=None):
+    """
+    Copy the catalog into a named shared memory block, in the Signs_Master.medb
+    layout, so worker processes can read it in place instead of receiving
+    pickled records. The caller owns the block: keep it alive while workers
+    run, then close() and unlink() it (or use release_shared_catalog).
+    :param signs: A SignTable, BinaryCatalog or list of sign records
+    :param name: Block name (default: generated by the OS layer)
+    :return: The SharedMemory block; pass block.name to the workers
+    """
+    data, count = pack_medut_binary(signs)
+    block = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+    block.buf[:len(data)] = data
+    logging.info(f"Sesh medu: Catalog published to shared memory '{block.name}' ({count} signs, {len(data)} bytes)")
+    return block
+
+
+def release_shared_catalog(block):
+    block.close()
+    block.unlink()
+
+
+def open_shared_block(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with the resource
+        # tracker as if this process owned it, so the tracker would unlink it
+        # behind the publisher's back. Skip that registration.
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None if rtype == "shared_memory" else register(name, rtype)
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedCatalog(BinaryCatalog):
+    """Read-only, zero-copy view of a catalog published with publish_shared_catalog."""
+
+    def __init__(self, name):
+        self.block = open_shared_block(name)
+        super().__init__(name, self.block.buf)
+
+    def close(self):
+        super().close()
+        if self.block is not None:
+            self.block.close()
+            self.block = None
+
+
+def attach_shared_catalog(name):
+    return SharedCatalog(name)
+
+
+def init_shared_catalog_worker(name):
+    """Pool initializer: attach the worker to the published catalog once."""
+    global worker_catalog
+    worker_catalog = attach_shared_catalog(name)
+
+
+def shared_catalog():
+    """The catalog this worker attached to in init_shared_catalog_worker."""
+    if worker_catalog is None:
+        raise RuntimeError("No shared catalog attached; start the pool with init_shared_catalog_worker")
+    return worker_catalog
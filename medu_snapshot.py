@@ -0,0 +1,168 @@
+from types import MappingProxyType
+from medu_parse import medut_record
+from medu_diff import diff_catalogs
+
+
+class CategoryPartition:
+    """
+    The signs of one category as an immutable tuple of read-only records,
+    with a code -> position index. Partitions are never changed after they are
+    built, so any number of snapshots can hold the same one.
+    """
+
+    __slots__ = ("category", "records", "positions")
+
+    def __init__(self, category, records):
+        self.category = category
+        self.records = tuple(record if isinstance(record, MappingProxyType) else MappingProxyType(dict(record))
+                             for record in records)
+        self.positions = {record["code"]: position for position, record in enumerate(self.records)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def get(self, code):
+        position = self.positions.get(code)
+        return None if position is None else self.records[position]
+
+
+class CatalogSnapshot:
+    """
+    Immutable, versioned catalog made of category partitions. Edits return a
+    new snapshot that rebuilds only the partitions they touch and shares every
+    other partition object with the snapshot it came from, so keeping several
+    revisions alive (production, candidate, preview) costs little more than
+    one. Records iterate grouped by category, categories in first-seen order.
+    """
+
+    __slots__ = ("version", "parent_version", "label", "partitions")
+
+    def __init__(self, partitions, version=1, parent_version=None, label=""):
+        self.version = version
+        self.parent_version = parent_version
+        self.label = label
+        # category -> CategoryPartition; dict order is the category order
+        self.partitions = MappingProxyType(dict(partitions))
+
+    @classmethod
+    def from_records(cls, records, label=""):
+        """Build the first snapshot; the first record for a code wins."""
+        grouped = {}
+        seen_codes = set()
+        for entry in records:
+            if entry["code"] in seen_codes:
+                continue
+            seen_codes.add(entry["code"])
+            grouped.setdefault(entry["category"], []).append(entry)
+        return cls({cat: CategoryPartition(cat, items) for cat, items in grouped.items()}, label=label)
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def __iter__(self):
+        for partition in self.partitions.values():
+            yield from partition
+
+    def __contains__(self, code):
+        return self.find(code) is not None
+
+    def categories(self):
+        return list(self.partitions)
+
+    def find(self, code):
+        """Record for a code, or None (one dict probe per category)."""
+        for partition in self.partitions.values():
+            record = partition.get(code)
+            if record is not None:
+                return record
+        return None
+
+    def records(self):
+        """Plain dict copies, for json.dump and other dict-only consumers."""
+        for record in self:
+            yield dict(record)
+
+    def evolve(self, upserts=(), removed_codes=(), label=None):
+        """
+        New snapshot with signs added or replaced and codes removed.
+        A replaced sign keeps its position unless it changes category, in
+        which case it moves to the end of its new category.
+        :param upserts: Sign records to add or replace (matched on code)
+        :param removed_codes: Codes to drop
+        """
+        upserts = {entry["code"]: entry for entry in upserts}
+        dropped = set(removed_codes) | set(upserts)
+        rebuilt = {}
+        for cat, partition in self.partitions.items():
+            if any(code in partition.positions for code in dropped):
+                rebuilt[cat] = [record for record in partition
+                                if record["code"] not in dropped
+                                or (record["code"] in upserts and upserts[record["code"]]["category"] == cat)]
+        for code, entry in upserts.items():
+            cat = entry["category"]
+            if cat not in rebuilt:
+                rebuilt[cat] = list(self.partitions[cat]) if cat in self.partitions else []
+            items = rebuilt[cat]
+            for position, record in enumerate(items):
+                if record["code"] == code:
+                    items[position] = entry
+                    break
+            else:
+                items.append(entry)
+
+        partitions = {}
+        for cat, partition in self.partitions.items():
+            items = rebuilt.pop(cat, None)
+            if items is None:
+                partitions[cat] = partition
+            elif items:
+                partitions[cat] = CategoryPartition(cat, items)
+        for cat, items in rebuilt.items():
+            if items:
+                partitions[cat] = CategoryPartition(cat, items)
+        return CatalogSnapshot(partitions, self.version + 1, self.version, self.label if label is None else label)
+
+    def apply_change_set(self, change_set, label=None):
+        """Replay a medu_diff change set (added, removed, changed and moved signs) onto this snapshot."""
+        upserts = [dict(entry) for entry in change_set["added"]]
+        for item in change_set["changed"]:
+            current = self.find(item["code"])
+            if current is not None:
+                record = dict(current)
+                for field, (old, new) in item["fields"].items():
+                    record[field] = new
+                upserts.append(medut_record(record["category"], record["code"], record["glyph"], record["description"]))
+        changed_codes = {entry["code"] for entry in upserts}
+        for item in change_set["moved"]:
+            if item["code"] in changed_codes:
+                for entry in upserts:
+                    if entry["code"] == item["code"]:
+                        entry["category"] = item["to"]
+            else:
+                current = self.find(item["code"])
+                if current is not None:
+                    upserts.append(dict(current, category=item["to"]))
+        removed_codes = [entry["code"] for entry in change_set["removed"]]
+        return self.evolve(upserts, removed_codes, label)
+
+    def shared_partitions(self, other):
+        """Categories whose partition object is shared with another snapshot."""
+        return [cat for cat, partition in self.partitions.items() if other.partitions.get(cat) is partition]
+
+
+def diff_snapshots(old, new):
+    """
+    diff_catalogs over the partitions that differ. Partitions shared by
+    identity are equal by construction and are skipped without looking at
+    their records; the summary still counts every sign.
+    """
+    shared = set(new.shared_partitions(old))
+    old_signs = [record for cat, partition in old.partitions.items() if cat not in shared for record in partition]
+    new_signs = [record for cat, partition in new.partitions.items() if cat not in shared for record in partition]
+    change_set = diff_catalogs(old_signs, new_signs)
+    change_set["summary"]["old_signs"] = len(old)
+    change_set["summary"]["new_signs"] = len(new)
+    return change_set
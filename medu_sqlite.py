@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import logging
+import argparse
+from itertools import islice
+
+SQLITE_SCHEMA = """
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE signs (
+    id INTEGER PRIMARY KEY,
+    code TEXT NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    glyph TEXT NOT NULL,
+    unicode_escape TEXT NOT NULL,
+    unicode_hex TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE codepoints (
+    sign_id INTEGER NOT NULL REFERENCES signs(id),
+    position INTEGER NOT NULL,
+    codepoint INTEGER NOT NULL,
+    PRIMARY KEY (sign_id, position)
+) WITHOUT ROWID;
+"""
+
+# Built after the bulk load; one sorted build is much cheaper than row-by-row upkeep.
+SQLITE_INDEXES = """
+CREATE UNIQUE INDEX idx_categories_name ON categories(name);
+CREATE UNIQUE INDEX idx_signs_code ON signs(code);
+CREATE INDEX idx_signs_category ON signs(category_id);
+CREATE INDEX idx_codepoints_codepoint ON codepoints(codepoint);
+"""
+
+SQLITE_FTS = """
+CREATE VIRTUAL TABLE signs_fts USING fts5(code, description, content='signs', content_rowid='id');
+INSERT INTO signs_fts(signs_fts) VALUES ('rebuild');
+"""
+
+SQLITE_BATCH = 10000
+
+
+def sqlite_sign_rows(signs, category_ids, codepoint_rows):
+    """Turn records into signs-table tuples, filling category_ids and codepoint_rows as it goes."""
+    seen_codes = set()
+    sign_id = 0
+    for entry in signs:
+        code = entry["code"]
+        if code in seen_codes:
+            continue
+        seen_codes.add(code)
+        sign_id += 1
+        category_id = category_ids.setdefault(entry["category"], len(category_ids) + 1)
+        glyph = entry["glyph"]
+        codepoint_rows.extend((sign_id, position, ord(ch)) for position, ch in enumerate(glyph))
+        yield (sign_id, code, category_id, glyph, entry["unicode_escape"], entry["unicode_hex"], entry.get("description", ""))
+
+
+def seal_medut_sqlite(path, signs, batch_size=SQLITE_BATCH):
+    """
+    Bulk-load the catalog into a fresh SQLite database.
+    Tables: categories, signs and codepoints (one row per code point of a
+    glyph), B-tree indexes on code, category and codepoint, and an FTS5
+    index over descriptions (skipped with a warning if SQLite lacks FTS5).
+    Everything is loaded with batched executemany in one transaction into a
+    temporary file that replaces path at the end.
+    :return: Number of signs written
+    """
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # The file is discarded on failure, so skip journaling and fsyncs.
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SQLITE_SCHEMA)
+        category_ids = {}
+        codepoint_rows = []
+        count = 0
+        rows = sqlite_sign_rows(signs, category_ids, codepoint_rows)
+        conn.execute("BEGIN")
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            conn.executemany("INSERT INTO signs VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            conn.executemany("INSERT INTO codepoints VALUES (?, ?, ?)", codepoint_rows)
+            codepoint_rows.clear()
+            count += len(batch)
+        conn.executemany("INSERT INTO categories VALUES (?, ?)", [(category_id, name) for name, category_id in category_ids.items()])
+        for statement in SQLITE_INDEXES.strip().split(";\n"):
+            conn.execute(statement)
+        try:
+            for statement in SQLITE_FTS.strip().split(";\n"):
+                conn.execute(statement)
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Isfet Kheper: FTS5 unavailable, description search skipped - {e}")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    logging.info(f"Sesh medu: Catalog sealed in SQLite ({path}, {count} signs)")
+    return count
+
+
+SIGN_SELECT = """
+SELECT c.name AS category, s.code, s.glyph, s.unicode_escape, s.unicode_hex, s.description
+FROM signs s JOIN categories c ON c.id = s.category_id
+"""
+
+
+def open_medut_sqlite(path):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def sqlite_lookup_code(conn, code):
+    row = conn.execute(SIGN_SELECT + "WHERE s.code = ?", (code,)).fetchone()
+    return dict(row) if row else None
+
+
+def sqlite_lookup_codepoint(conn, codepoint):
+    """Signs whose glyph contains the code point."""
+    return [dict(row) for row in conn.execute(
+        SIGN_SELECT + "WHERE s.id IN (SELECT sign_id FROM codepoints WHERE codepoint = ?) ORDER BY s.id", (codepoint,))]
+
+
+def sqlite_search_descriptions(conn, query, limit=20):
+    """FTS5 MATCH over code and description, best matches first."""
+    return [dict(row) for row in conn.execute(
+        SIGN_SELECT + "JOIN signs_fts f ON f.rowid = s.id WHERE signs_fts MATCH ? ORDER BY f.rank LIMIT ?", (query, limit))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a Signs_Master.sqlite catalog.")
+    parser.add_argument('db', type=str, help="Signs_Master.sqlite")
+    parser.add_argument('--code', type=str, help="Sign code to look up")
+    parser.add_argument('--codepoint', type=str, help="Code point to look up (e.g. U+13000 or 13000)")
+    parser.add_argument('--search', type=str, help="FTS5 query over descriptions")
+    parser.add_argument('--limit', type=int, default=20, help="Maximum search results")
+    args = parser.parse_args()
+
+    conn = open_medut_sqlite(args.db)
+    try:
+        results = []
+        if args.code:
+            entry = sqlite_lookup_code(conn, args.code)
+            results.extend([entry] if entry else [])
+        if args.codepoint:
+            results.extend(sqlite_lookup_codepoint(conn, int(args.codepoint.upper().replace("U+", ""), 16)))
+        if args.search:
+            results.extend(sqlite_search_descriptions(conn, args.search, args.limit))
+        for entry in results:
+            print(f"{entry['code']}\t{entry['glyph']}\t{entry['unicode_hex']}\t[{entry['category']}] {entry['description']}".rstrip())
+        if not results:
+            print("No signs found.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+
+
+def source_stat(json_path):
+    """
+    (size, mtime_ns) of the Signs_Master.json a sidecar mirrors, stamped into
+    the sidecar when it is sealed; (0, 0) when there is no JSON.
+    """
+    try:
+        stat = os.stat(json_path) if json_path else None
+    except OSError:
+        stat = None
+    return (stat.st_size, stat.st_mtime_ns) if stat else (0, 0)
+
+
+def source_fresh(source_size, source_mtime, json_path):
+    """True when a sidecar stamped with (source_size, source_mtime) was built from json_path as it is now."""
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        # No JSON to compare against; the sidecar is all there is.
+        return True
+    return source_size == stat.st_size and source_mtime == stat.st_mtime_ns
@@ -0,0 +1,232 @@
+from array import array
+from collections.abc import Mapping
+from medu_parse import glyph_unicode_escape, glyph_unicode_hex
+
+SIGN_FIELDS = ("category", "code", "glyph", "unicode_escape", "unicode_hex", "description")
+
+
+class StringColumn:
+    """Strings packed end to end as UTF-8 in one bytearray, with an offset table."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('Q', [0])
+
+    def append(self, text):
+        self.data += text.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    def __iter__(self):
+        data = self.data
+        offsets = self.offsets
+        for index in range(len(offsets) - 1):
+            yield data[offsets[index]:offsets[index + 1]].decode('utf-8')
+
+    def nbytes(self):
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+    @classmethod
+    def from_packed(cls, packed):
+        """Column from medu_derive output: (uint8 array of text, end offset of each string)."""
+        out, ends = packed
+        column = cls()
+        column.data = bytearray(out.tobytes())
+        column.offsets.frombytes(ends.astype('uint64').tobytes())
+        return column
+
+
+class SignRow(Mapping):
+    """
+    Read-only view of one sign, with the same keys (in the same order) as a
+    medut_record dict, so exporters written against dicts keep working.
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, field):
+        return self.table.value(self.index, field)
+
+    def __iter__(self):
+        return iter(SIGN_FIELDS)
+
+    def __len__(self):
+        return len(SIGN_FIELDS)
+
+    def to_dict(self):
+        return self.table.record(self.index)
+
+    def __repr__(self):
+        return f"SignRow({self.to_dict()!r})"
+
+
+class SignTable:
+    """
+    Column store for a sign catalog. Codes, glyphs and descriptions live in
+    StringColumns, each sign's category is a small integer into an interned
+    list of names, and unicode_escape / unicode_hex are derived from the glyph
+    when read instead of being stored, unless derive_unicode() has filled
+    them as columns. Rows are SignRow mappings.
+    A dict per sign costs several hundred bytes; a row here costs the UTF-8
+    text plus a few offsets.
+    """
+
+    def __init__(self):
+        self.category_names = []
+        self.category_ids = {}
+        self.categories = array('I')
+        self.codes = StringColumn()
+        self.glyphs = StringColumn()
+        self.descriptions = StringColumn()
+        self.escapes = None
+        self.hexes = None
+        self.order = None
+        self.code_rows = {}
+
+    def intern_category(self, category):
+        category_id = self.category_ids.get(category)
+        if category_id is None:
+            category_id = len(self.category_names)
+            self.category_names.append(category)
+            self.category_ids[category] = category_id
+        return category_id
+
+    def append(self, category, code, glyph, description=""):
+        """Add a sign unless its code is already present (first wins). Returns True if added."""
+        if code in self.code_rows:
+            return False
+        self.code_rows[code] = len(self.codes)
+        self.categories.append(self.intern_category(category))
+        self.codes.append(code)
+        self.glyphs.append(glyph)
+        self.descriptions.append(description)
+        self.order = None
+        if self.escapes is not None:
+            self.escapes.append(glyph_unicode_escape(glyph))
+            self.hexes.append(glyph_unicode_hex(glyph))
+        return True
+
+    def extend(self, records):
+        """Append sign records (dicts or rows); unicode fields are ignored, they are derived."""
+        for entry in records:
+            self.append(entry["category"], entry["code"], entry["glyph"], entry.get("description", ""))
+
+    @classmethod
+    def from_records(cls, records):
+        table = cls()
+        table.extend(records)
+        return table
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sign index out of range")
+        return SignRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SignRow(self, index)
+
+    def __contains__(self, code):
+        return code in self.code_rows
+
+    def find(self, code):
+        """Row for a sign code, or None."""
+        index = self.code_rows.get(code)
+        return None if index is None else SignRow(self, index)
+
+    def category(self, index):
+        return self.category_names[self.categories[index]]
+
+    def value(self, index, field):
+        if field == "code":
+            return self.codes[index]
+        if field == "glyph":
+            return self.glyphs[index]
+        if field == "description":
+            return self.descriptions[index]
+        if field == "category":
+            return self.category(index)
+        if field == "unicode_escape":
+            return self.unicode_escape(index)
+        if field == "unicode_hex":
+            return self.unicode_hex(index)
+        raise KeyError(field)
+
+    def unicode_escape(self, index):
+        if self.escapes is not None:
+            return self.escapes[index]
+        return glyph_unicode_escape(self.glyphs[index])
+
+    def unicode_hex(self, index):
+        if self.hexes is not None:
+            return self.hexes[index]
+        return glyph_unicode_hex(self.glyphs[index])
+
+    def derive_unicode(self):
+        """
+        Fill the unicode_escape and unicode_hex columns for every sign in one
+        NumPy pass over the glyph column (see medu_derive). Worth it before
+        exporting every field several times; without NumPy the fields stay
+        derived per read. Returns True if the columns were filled.
+        """
+        # Imported here so readers that never derive (lookups, sidecar loads) do not pay for NumPy.
+        from medu_derive import np, utf8_column_codepoints, bulk_unicode_escape, bulk_unicode_hex
+        if np is None:
+            return False
+        codepoints, offsets = utf8_column_codepoints(self.glyphs.data, self.glyphs.offsets)
+        self.escapes = StringColumn.from_packed(bulk_unicode_escape(codepoints, offsets))
+        self.hexes = StringColumn.from_packed(bulk_unicode_hex(codepoints, offsets))
+        return True
+
+    def gardiner_order(self):
+        """Row indices in Gardiner order, computed once and kept until the next append."""
+        if self.order is None:
+            from medu_collate import gardiner_order
+            self.order = gardiner_order(list(self.codes))
+        return self.order
+
+    def record(self, index):
+        """One sign as a plain medut_record dict."""
+        return {
+            "category": self.category(index),
+            "code": self.codes[index],
+            "glyph": self.glyphs[index],
+            "unicode_escape": self.unicode_escape(index),
+            "unicode_hex": self.unicode_hex(index),
+            "description": self.descriptions[index]
+        }
+
+    def records(self, indices=None):
+        """Generator of plain dicts, for json.dump and other dict-only consumers."""
+        for index in range(len(self)) if indices is None else indices:
+            yield self.record(index)
+
+    def category_rows(self):
+        """Category name -> row indices, categories in first-seen order."""
+        rows = {name: array('I') for name in self.category_names}
+        names = self.category_names
+        for index, category_id in enumerate(self.categories):
+            rows[names[category_id]].append(index)
+        return rows
+
+    def nbytes(self):
+        """Approximate size of the column data (excluding the code index)."""
+        derived = sum(column.nbytes() for column in (self.escapes, self.hexes) if column is not None)
+        return (self.codes.nbytes() + self.glyphs.nbytes() + self.descriptions.nbytes() + derived
+                + self.categories.itemsize * len(self.categories))
@@ -0,0 +1,109 @@
+import os
+import copy
+import time
+import struct
+import logging
+import zipfile
+
+
+def papyri_snapshot(folder, names):
+    """(size, mtime_ns) for every papyrus; vanished files are left out."""
+    snapshot = {}
+    for name in names:
+        try:
+            stat = os.stat(os.path.join(folder, name))
+        except OSError:
+            continue
+        snapshot[name] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def watch_papyri(folder, discover, on_change, interval=0.25, debounce=0.4):
+    """
+    Poll the input folder and call on_change once a burst of saves settles.
+    Polling stats a few dozen files per tick, so it needs no extra packages
+    and behaves the same on Windows and Linux.
+    :param folder: Input folder (per_medut_in)
+    :param discover: Callable returning the current papyri names (relative to folder)
+    :param on_change: Called with the set of added, removed or modified names
+    :param interval: Seconds between polls
+    :param debounce: Quiet period required after the last change before rebuilding
+    """
+    current = papyri_snapshot(folder, discover())
+    try:
+        while True:
+            time.sleep(interval)
+            latest = papyri_snapshot(folder, discover())
+            if latest == current:
+                continue
+            # Debounce: editors often write a file several times per save.
+            settled_at = time.monotonic()
+            while time.monotonic() - settled_at < debounce:
+                time.sleep(interval)
+                newer = papyri_snapshot(folder, discover())
+                if newer != latest:
+                    latest = newer
+                    settled_at = time.monotonic()
+            changed = {name for name in set(current) | set(latest) if current.get(name) != latest.get(name)}
+            current = latest
+            try:
+                on_change(changed)
+            except Exception as e:
+                logging.error(f"Isfet Kheper: Watch rebuild failed - {e}")
+                print(f"Isfet Kheper: Watch rebuild failed - {e}")
+    except KeyboardInterrupt:
+        print("\nWatch stopped.")
+        logging.info("Ma’at Kheper: Watch mode stopped.")
+
+
+def copy_member_raw(zin, zout, info):
+    """
+    Copy one zip member's compressed bytes into another open archive without
+    inflating and deflating them again.
+    :param zin: Source zipfile.ZipFile opened for reading
+    :param zout: Destination zipfile.ZipFile opened for writing
+    :param info: ZipInfo of the member in zin
+    """
+    zin.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, zin.fp.read(zipfile.sizeFileHeader))
+    zin.fp.seek(header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+    out_info = copy.copy(info)
+    # CRC and sizes go in the local header, so no trailing data descriptor is needed.
+    out_info.flag_bits &= ~0x08
+    out_info.header_offset = zout.fp.tell()
+    zout.fp.write(out_info.FileHeader())
+    remaining = info.compress_size
+    while remaining:
+        chunk = zin.fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        zout.fp.write(chunk)
+        remaining -= len(chunk)
+    zout.start_dir = zout.fp.tell()
+    zout.filelist.append(out_info)
+    zout.NameToInfo[out_info.filename] = out_info
+    zout._didModify = True
+
+
+def refresh_kheper_archive(zip_path, files, base_dir, removed=()):
+    """
+    Replace or add the given files in an existing zip and drop removed ones.
+    Untouched members are copied across still compressed; only the given
+    files are read from disk and deflated.
+    """
+    replace = {os.path.relpath(path, base_dir).replace(os.sep, "/"): path for path in files if os.path.exists(path)}
+    drop = {os.path.relpath(path, base_dir).replace(os.sep, "/") for path in removed}
+    tmp_path = zip_path + ".tmp"
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zout:
+        if os.path.exists(zip_path):
+            with zipfile.ZipFile(zip_path, 'r') as zin:
+                # dict.fromkeys: archives grown with mode 'a' can hold a name
+                # twice; getinfo() returns the newest copy.
+                for name in dict.fromkeys(zin.namelist()):
+                    if name in replace or name in drop:
+                        continue
+                    copy_member_raw(zin, zout, zin.getinfo(name))
+        for arcname, path in replace.items():
+            zout.write(path, arcname)
+    os.replace(tmp_path, zip_path)
+    logging.info(f"Sesh medu: Archive refreshed ({len(replace)} replaced, {len(drop)} dropped) at {zip_path}")
@@ -0,0 +1,25 @@
+import io
+import json
+import unittest
+from medu_merge import iter_json_array
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def test_number_straddling_chunk_boundary(self):
+        self.assertEqual(list(iter_json_array(io.StringIO("[12345, 6]"), chunk_size=3)), [12345, 6])
+        self.assertEqual(list(iter_json_array(io.StringIO("[-0.25]"), chunk_size=4)), [-0.25])
+
+    def test_matches_json_load_for_every_chunk_size(self):
+        signs = [{"code": "A1", "glyph": "\U00013000", "description": "seated man"}, 7, -0.25, "G1", [1, 2], None]
+        text = json.dumps(signs, ensure_ascii=False, indent=2)
+        for chunk_size in range(1, len(text) + 2):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)), signs)
+
+    def test_truncated_array_raises(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO("[1, 2"), chunk_size=2))
+
+
+if __name__ == "__main__":
+    unittest.main()